@@ -2,14 +2,57 @@
 Django admin for AI content generation.
 """
 from django.contrib import admin
-from django.utils.html import format_html
+from django.utils.html import format_html_join
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.contrib import messages
+from django.utils.translation import ngettext
 from django.shortcuts import redirect
 from .models_ai import ContentGenerationRequest, AIContentMetrics
+from .tasks_scraping import ASYNC_ACTION_THRESHOLD
 from utils.ai_client import ai_client
 
+# (admin url name, label, link target) for the buttons shown per request status
+STATUS_BUTTONS = {
+    'pending': (
+        ('generate_content', '🤖 Generate', '_self'),
+    ),
+    'review': (
+        ('preview_content', '👀 Preview', '_blank'),
+        ('approve_content', '✅ Approve', '_self'),
+        ('reject_content', '❌ Reject', '_self'),
+    ),
+    'approved': (
+        ('publish_content', '📝 Create Article', '_self'),
+    ),
+}
+
+
+def _action_url_template(url_name):
+    """Reverse an action URL once and turn it into a template for any request id."""
+    prefix, _, suffix = reverse(f'admin:{url_name}', args=[0]).rpartition('/0/')
+    return f'{prefix}/{{}}/{suffix}'
+
+
+def _render_action_buttons(status, obj_id, url_templates):
+    """
+    Render the action buttons for a request in the given status.
+    
+    ``url_templates`` memoises reversed URLs for one changelist request; they
+    carry that request's script prefix, so they must not outlive it.
+    """
+    for url_name, _, _ in STATUS_BUTTONS.get(status, ()):
+        if url_name not in url_templates:
+            url_templates[url_name] = _action_url_template(url_name)
+    return format_html_join(
+        ' ',
+        '<a class="button" href="{}" target="{}">{}</a>',
+        (
+            (url_templates[url_name].format(obj_id), target, label)
+            for url_name, label, target in STATUS_BUTTONS.get(status, ())
+        )
+    )
+
 
 @admin.register(ContentGenerationRequest)
 class ContentGenerationRequestAdmin(admin.ModelAdmin):
@@ -19,6 +62,10 @@ class ContentGenerationRequestAdmin(admin.ModelAdmin):
     ]
     list_filter = ['status', 'category', 'model_used', 'created_at']
     search_fields = ['topic', 'generated_title', 'generated_content']
+    list_select_related = ('category', 'requested_by', 'reviewed_by', 'published_article')
+    sortable_by = ('created_at', 'id', 'status')
+    autocomplete_fields = ('requested_by', 'reviewed_by')
+    raw_id_fields = ('published_article',)
     readonly_fields = [
         'created_at', 'updated_at', 'generation_started_at', 
         'generation_completed_at', 'model_used', 'prompt_used',
@@ -55,43 +102,35 @@ class ContentGenerationRequestAdmin(admin.ModelAdmin):
         }),
     )
     
-    def action_buttons(self, obj):
+    def action_buttons(self, obj, url_templates=None):
         """Display action buttons for each request."""
-        buttons = []
-        
-        if obj.status == 'pending':
-            generate_url = reverse('admin:generate_content', args=[obj.id])
-            buttons.append(
-                f'<a class="button" href="{generate_url}">🤖 Generate</a>'
-            )
+        if obj.status == 'review' and not obj.generated_content:
+            return ''
+        if obj.status == 'approved' and obj.published_article_id:
+            return ''
         
-        if obj.status == 'review' and obj.generated_content:
-            preview_url = reverse('admin:preview_content', args=[obj.id])
-            buttons.append(
-                f'<a class="button" href="{preview_url}" target="_blank">👀 Preview</a>'
-            )
-            
-            approve_url = reverse('admin:approve_content', args=[obj.id])
-            buttons.append(
-                f'<a class="button" href="{approve_url}">✅ Approve</a>'
-            )
-            
-            reject_url = reverse('admin:reject_content', args=[obj.id])
-            buttons.append(
-                f'<a class="button" href="{reject_url}">❌ Reject</a>'
-            )
-        
-        if obj.status == 'approved' and not obj.published_article:
-            publish_url = reverse('admin:publish_content', args=[obj.id])
-            buttons.append(
-                f'<a class="button" href="{publish_url}">📝 Create Article</a>'
-            )
-        
-        return format_html(' '.join(buttons))
+        return _render_action_buttons(
+            obj.status, obj.id, {} if url_templates is None else url_templates
+        )
     
     action_buttons.short_description = 'Actions'
     action_buttons.allow_tags = True
     
+    def get_changelist_instance(self, request):
+        """Bind the action buttons column to a URL memo for this request only."""
+        changelist = super().get_changelist_instance(request)
+        url_templates = {}
+        
+        def action_buttons(obj):
+            return self.action_buttons(obj, url_templates)
+        
+        action_buttons.short_description = self.action_buttons.short_description
+        changelist.list_display = [
+            action_buttons if name == 'action_buttons' else name
+            for name in changelist.list_display
+        ]
+        return changelist
+    
     def get_queryset(self, request):
         return super().get_queryset(request).select_related(
             'category', 'requested_by', 'reviewed_by', 'published_article'
@@ -101,19 +140,35 @@ class ContentGenerationRequestAdmin(admin.ModelAdmin):
     
     def regenerate_content(self, request, queryset):
         """Regenerate content for selected requests."""
-        count = 0
-        for req in queryset.filter(status__in=['failed', 'rejected']):
-            req.status = 'pending'
-            req.generated_content = ''
-            req.generated_outline = ''
-            req.generated_title = ''
-            req.review_notes = ''
-            req.save()
-            count += 1
+        from .tasks_ai import regenerate_content_requests
+        
+        request_ids = list(
+            queryset.filter(status__in=['failed', 'rejected']).values_list('id', flat=True)
+        )
+        
+        if len(request_ids) > ASYNC_ACTION_THRESHOLD:
+            regenerate_content_requests.delay(request_ids)
+            count = len(request_ids)
+            self.message_user(
+                request,
+                ngettext(
+                    'Marking %d request for regeneration in the background.',
+                    'Marking %d requests for regeneration in the background.',
+                    count
+                ) % count,
+                messages.SUCCESS
+            )
+            return
+        
+        count = regenerate_content_requests(request_ids)
         
         self.message_user(
             request, 
-            f'Marked {count} requests for regeneration.',
+            ngettext(
+                'Marked %d request for regeneration.',
+                'Marked %d requests for regeneration.',
+                count
+            ) % count,
             messages.SUCCESS
         )
     
@@ -128,7 +183,11 @@ class ContentGenerationRequestAdmin(admin.ModelAdmin):
         
         self.message_user(
             request, 
-            f'Approved {count} content requests.',
+            ngettext(
+                'Approved %d content request.',
+                'Approved %d content requests.',
+                count
+            ) % count,
             messages.SUCCESS
         )
     
@@ -144,7 +203,11 @@ class ContentGenerationRequestAdmin(admin.ModelAdmin):
         
         self.message_user(
             request, 
-            f'Rejected {count} content requests.',
+            ngettext(
+                'Rejected %d content request.',
+                'Rejected %d content requests.',
+                count
+            ) % count,
             messages.SUCCESS
         )
     
@@ -158,6 +221,7 @@ class AIContentMetricsAdmin(admin.ModelAdmin):
         'final_word_count', 'human_edit_percentage', 'engagement_score'
     ]
     list_filter = ['created_at']
+    list_select_related = ('article',)
     readonly_fields = ['created_at']
     
     def get_queryset(self, request):
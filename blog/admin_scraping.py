@@ -1,15 +1,130 @@
 """
 Django admin for web scraping and data-driven content generation.
 """
+from celery import group
 from django.contrib import admin
-from django.utils.html import format_html
-from django.urls import reverse
+from django.utils.html import format_html, format_html_join
+from django.http import Http404, JsonResponse
+from django.urls import path, reverse
 from django.contrib import messages
+from django.utils.translation import ngettext
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.db.models import Case, CharField, Value, When
 from django.utils.safestring import mark_safe
 from .models_scraping import (
     ScrapingSource, ScrapedData, TrendingTopic, 
     ScrapingLog, ContentGenerationQueue
 )
+from .tasks_scraping import ASYNC_ACTION_THRESHOLD
+from utils.paginators import TimeoutEstimatedCountPaginator
+
+DEFAULT_CATEGORY_CACHE_KEY = "default_category_id"
+
+HEALTH_BADGES = {
+    'healthy': format_html('<span style="color: green;">✓ Healthy</span>'),
+    'warning': format_html('<span style="color: orange;">⚠ Warning</span>'),
+    'unhealthy': format_html('<span style="color: red;">✗ Unhealthy</span>'),
+}
+
+
+def _is_changelist(request):
+    """Whether the admin request is rendering a changelist page."""
+    match = request.resolver_match
+    return bool(match and match.url_name and match.url_name.endswith('_changelist'))
+
+
+def _default_category_id():
+    """PK of the category scraped items are queued under, cached for five minutes."""
+    category_id = cache.get(DEFAULT_CATEGORY_CACHE_KEY)
+    
+    if category_id is None:
+        from blog.models import Category
+        
+        category_id = (
+            Category.objects.filter(slug='tech').values_list('id', flat=True).first()
+            or Category.objects.order_by('name').values_list('id', flat=True).first()
+        )
+        if category_id:
+            cache.set(DEFAULT_CATEGORY_CACHE_KEY, category_id, 300)
+    
+    return category_id
+
+
+class LazyFieldAdminMixin:
+    """
+    Keep one large field off the change form unless ``?show_raw=1`` is passed.
+    
+    The field is deferred from the admin queryset and replaced on the form by
+    a link to a JSON view that loads just that column.
+    """
+    lazy_field = None
+    
+    def show_lazy_field(self, request):
+        return request.GET.get('show_raw') == '1'
+    
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if not self.show_lazy_field(request):
+            qs = qs.defer(self.lazy_field)
+        return qs
+    
+    def get_readonly_fields(self, request, obj=None):
+        return tuple(super().get_readonly_fields(request, obj)) + ('lazy_field_link',)
+    
+    def get_fieldsets(self, request, obj=None):
+        fieldsets = super().get_fieldsets(request, obj)
+        if self.show_lazy_field(request) or obj is None:
+            return fieldsets
+        
+        def swap(fields):
+            swapped = []
+            for field in fields:
+                if field == self.lazy_field:
+                    field = 'lazy_field_link'
+                if field not in swapped:
+                    swapped.append(field)
+            return tuple(swapped)
+        
+        return [
+            (name, {**options, 'fields': swap(options['fields'])})
+            for name, options in fieldsets
+        ]
+    
+    def lazy_field_link(self, obj):
+        if obj is None or obj.pk is None:
+            return '-'
+        opts = self.model._meta
+        url = reverse(f'admin:{opts.app_label}_{opts.model_name}_lazy_field', args=[obj.pk])
+        return format_html(
+            '<a class="button" href="{}" target="_blank">View {}</a> '
+            '<a class="button" href="?show_raw=1">Show inline</a>',
+            url, self.lazy_field.replace('_', ' ')
+        )
+    
+    lazy_field_link.short_description = 'Raw data'
+    
+    def get_urls(self):
+        opts = self.model._meta
+        return [
+            path(
+                '<path:object_id>/lazy-field/',
+                self.admin_site.admin_view(self.lazy_field_view),
+                name=f'{opts.app_label}_{opts.model_name}_lazy_field'
+            ),
+        ] + super().get_urls()
+    
+    def lazy_field_view(self, request, object_id):
+        """Return only the lazy field's value as JSON."""
+        if not self.has_view_or_change_permission(request):
+            raise PermissionDenied
+        
+        values = self.model._default_manager.filter(pk=object_id).values_list(
+            self.lazy_field, flat=True
+        )
+        if not values:
+            raise Http404
+        return JsonResponse({self.lazy_field: values[0]})
 
 
 @admin.register(ScrapingSource)
@@ -44,16 +159,22 @@ class ScrapingSourceAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            health=Case(
+                When(consecutive_failures=0, then=Value('healthy')),
+                When(consecutive_failures__lt=3, then=Value('warning')),
+                default=Value('unhealthy'),
+                output_field=CharField()
+            )
+        )
+    
     def health_status(self, obj):
         """Display health status with colors."""
-        if obj.consecutive_failures == 0:
-            return format_html('<span style="color: green;">✓ Healthy</span>')
-        elif obj.consecutive_failures < 3:
-            return format_html('<span style="color: orange;">⚠ Warning</span>')
-        else:
-            return format_html('<span style="color: red;">✗ Unhealthy</span>')
+        return HEALTH_BADGES[obj.health]
     
     health_status.short_description = 'Health'
+    health_status.admin_order_field = 'consecutive_failures'
     
     actions = ['trigger_scraping', 'reset_failures']
     
@@ -61,14 +182,17 @@ class ScrapingSourceAdmin(admin.ModelAdmin):
         """Trigger scraping for selected sources."""
         from .tasks_scraping import scrape_website
         
-        count = 0
-        for source in queryset.filter(enabled=True):
-            scrape_website.delay(source.id)
-            count += 1
+        source_ids = list(queryset.filter(enabled=True).values_list('id', flat=True))
+        group(scrape_website.s(source_id) for source_id in source_ids).apply_async()
+        count = len(source_ids)
         
         self.message_user(
             request,
-            f'Triggered scraping for {count} sources.',
+            ngettext(
+                'Triggered scraping for %d source.',
+                'Triggered scraping for %d sources.',
+                count
+            ) % count,
             messages.SUCCESS
         )
     
@@ -79,7 +203,11 @@ class ScrapingSourceAdmin(admin.ModelAdmin):
         count = queryset.update(consecutive_failures=0)
         self.message_user(
             request,
-            f'Reset failure count for {count} sources.',
+            ngettext(
+                'Reset failure count for %d source.',
+                'Reset failure count for %d sources.',
+                count
+            ) % count,
             messages.SUCCESS
         )
     
@@ -87,15 +215,21 @@ class ScrapingSourceAdmin(admin.ModelAdmin):
 
 
 @admin.register(ScrapedData)
-class ScrapedDataAdmin(admin.ModelAdmin):
+class ScrapedDataAdmin(LazyFieldAdminMixin, admin.ModelAdmin):
+    lazy_field = 'raw_data'
     list_display = [
-        'title', 'source', 'category', 'price', 'content_generated', 
+        'title', 'source', 'category', 'current_price', 'content_generated', 
         'scraped_at', 'data_actions'
     ]
+    list_select_related = ('source',)
     list_filter = [
         'source', 'content_generated', 'scraped_at', 'category'
     ]
+    paginator = TimeoutEstimatedCountPaginator
+    show_full_result_count = False
     search_fields = ['title', 'description', 'category', 'tags']
+    sortable_by = ('scraped_at', 'id')
+    ordering = ('-scraped_at',)
     readonly_fields = ['scraped_at', 'updated_at', 'external_id']
     date_hierarchy = 'scraped_at'
     
@@ -104,7 +238,7 @@ class ScrapedDataAdmin(admin.ModelAdmin):
             'fields': ('source', 'external_id', 'title', 'url')
         }),
         ('Content Data', {
-            'fields': ('description', 'price', 'category', 'tags', 'image_urls')
+            'fields': ('description', 'current_price', 'category', 'tags', 'image_urls')
         }),
         ('Metrics', {
             'fields': ('views', 'likes', 'sales', 'rating'),
@@ -124,21 +258,34 @@ class ScrapedDataAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        qs = super().get_queryset(request).select_related('source')
+        if _is_changelist(request):
+            # Only load the columns rendered on the list, skipping the JSON/text blobs
+            qs = qs.only(
+                'id', 'title', 'url', 'category', 'current_price',
+                'content_generated', 'scraped_at',
+                'source__name', 'source__website'
+            )
+        return qs
+    
     def data_actions(self, obj):
         """Display action buttons."""
         buttons = []
         
         if not obj.content_generated:
-            buttons.append(
-                f'<a class="button" href="#" onclick="generateContent({obj.id})">🤖 Generate Content</a>'
-            )
+            buttons.append((
+                '#', f'generateContent({obj.id})', '_self', '🤖 Generate Content'
+            ))
         
         if obj.url:
-            buttons.append(
-                f'<a class="button" href="{obj.url}" target="_blank">🔗 View Original</a>'
-            )
+            buttons.append((obj.url, '', '_blank', '🔗 View Original'))
         
-        return format_html(' '.join(buttons))
+        return format_html_join(
+            ' ',
+            '<a class="button" href="{}" onclick="{}" target="{}">{}</a>',
+            buttons
+        )
     
     data_actions.short_description = 'Actions'
     data_actions.allow_tags = True
@@ -147,14 +294,11 @@ class ScrapedDataAdmin(admin.ModelAdmin):
     
     def queue_for_content_generation(self, request, queryset):
         """Queue selected items for content generation."""
-        from blog.models import Category
+        from .tasks_scraping import queue_scraped_items_for_content
         
-        try:
-            default_category = Category.objects.get(slug='tech')
-        except Category.DoesNotExist:
-            default_category = Category.objects.first()
+        default_category_id = _default_category_id()
         
-        if not default_category:
+        if not default_category_id:
             self.message_user(
                 request,
                 'No categories available. Create a category first.',
@@ -162,34 +306,33 @@ class ScrapedDataAdmin(admin.ModelAdmin):
             )
             return
         
-        count = 0
-        for item in queryset.filter(content_generated=False):
-            ContentGenerationQueue.objects.get_or_create(
-                target_category=default_category,
-                defaults={
-                    'content_type': 'product_review',
-                    'title': f"Review: {item.title}",
-                    'priority': 'normal',
-                    'context_data': {
-                        'scraped_item_id': item.id,
-                        'source': item.source.name,
-                        'price': item.price,
-                        'category': item.category
-                    }
-                }
+        item_ids = list(
+            queryset.filter(content_generated=False).values_list('id', flat=True)
+        )
+        count = len(item_ids)
+        
+        if count > ASYNC_ACTION_THRESHOLD:
+            queue_scraped_items_for_content.delay(item_ids, default_category_id)
+            self.message_user(
+                request,
+                ngettext(
+                    'Queuing %d item for content generation in the background.',
+                    'Queuing %d items for content generation in the background.',
+                    count
+                ) % count,
+                messages.SUCCESS
             )
-            # Add the scraped item to the queue after creation
-            queue_item = ContentGenerationQueue.objects.filter(
-                title=f"Review: {item.title}"
-            ).first()
-            if queue_item:
-                queue_item.scraped_items.add(item)
-            
-            count += 1
+            return
+        
+        queue_scraped_items_for_content(item_ids, default_category_id)
         
         self.message_user(
             request,
-            f'Queued {count} items for content generation.',
+            ngettext(
+                'Queued %d item for content generation.',
+                'Queued %d items for content generation.',
+                count
+            ) % count,
             messages.SUCCESS
         )
     
@@ -203,7 +346,9 @@ class TrendingTopicAdmin(admin.ModelAdmin):
         'trending_score', 'content_generated', 'last_updated'
     ]
     list_filter = ['source', 'content_generated', 'category', 'last_updated']
+    list_select_related = ('source',)
     search_fields = ['topic', 'category']
+    sortable_by = ('frequency', 'last_updated')
     readonly_fields = ['trending_score', 'first_seen', 'last_updated']
     
     fieldsets = (
@@ -227,18 +372,32 @@ class TrendingTopicAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if _is_changelist(request):
+            qs = qs.defer('sample_items')
+        return qs
+    
     actions = ['generate_trend_content']
     
     def generate_trend_content(self, request, queryset):
         """Generate content for selected trending topics."""
         from .tasks_scraping import queue_trending_content
         
-        for topic in queryset.filter(content_generated=False):
-            queue_trending_content.delay(topic.source.id)
+        topic_sources = list(
+            queryset.filter(content_generated=False).values_list('source_id', flat=True)
+        )
+        source_ids = set(topic_sources)
+        group(queue_trending_content.s(source_id) for source_id in source_ids).apply_async()
+        count = len(topic_sources)
         
         self.message_user(
             request,
-            f'Queued content generation for {queryset.count()} trending topics.',
+            ngettext(
+                'Queued content generation for %d trending topic.',
+                'Queued content generation for %d trending topics.',
+                count
+            ) % count,
             messages.SUCCESS
         )
     
@@ -246,12 +405,18 @@ class TrendingTopicAdmin(admin.ModelAdmin):
 
 
 @admin.register(ScrapingLog)
-class ScrapingLogAdmin(admin.ModelAdmin):
+class ScrapingLogAdmin(LazyFieldAdminMixin, admin.ModelAdmin):
+    lazy_field = 'error_traceback'
     list_display = [
         'source', 'status', 'items_found', 'items_new', 'items_updated', 
         'items_failed', 'duration_seconds', 'started_at'
     ]
     list_filter = ['status', 'source', 'started_at']
+    list_select_related = ('source',)
+    paginator = TimeoutEstimatedCountPaginator
+    show_full_result_count = False
+    sortable_by = ('started_at', 'id')
+    ordering = ('-started_at',)
     readonly_fields = [
         'source', 'status', 'items_found', 'items_new', 'items_updated',
         'items_failed', 'started_at', 'completed_at', 'duration_seconds',
@@ -259,6 +424,13 @@ class ScrapingLogAdmin(admin.ModelAdmin):
     ]
     date_hierarchy = 'started_at'
     
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if _is_changelist(request):
+            # Error details are only shown on the change form
+            qs = qs.defer('error_traceback', 'error_message')
+        return qs
+    
     def has_add_permission(self, request):
         return False  # Logs are created automatically
     
@@ -278,7 +450,10 @@ class ContentGenerationQueueAdmin(admin.ModelAdmin):
     ]
     search_fields = ['title']
     readonly_fields = ['created_at']
-    filter_horizontal = ['scraped_items']
+    autocomplete_fields = ('scraped_items', 'trending_topic', 'content_request')
+    raw_id_fields = ('target_category',)
+    paginator = TimeoutEstimatedCountPaginator
+    show_full_result_count = False
     
     fieldsets = (
         ('Content Details', {
@@ -301,14 +476,17 @@ class ContentGenerationQueueAdmin(admin.ModelAdmin):
         """Process selected queue items for content generation."""
         from .tasks_scraping import generate_content_from_data
         
-        count = 0
-        for item in queryset.filter(processed=False):
-            generate_content_from_data.delay(item.id)
-            count += 1
+        item_ids = list(queryset.filter(processed=False).values_list('id', flat=True))
+        group(generate_content_from_data.s(item_id) for item_id in item_ids).apply_async()
+        count = len(item_ids)
         
         self.message_user(
             request,
-            f'Started processing {count} queue items.',
+            ngettext(
+                'Started processing %d queue item.',
+                'Started processing %d queue items.',
+                count
+            ) % count,
             messages.SUCCESS
         )
     
@@ -1,15 +1,25 @@
 """
 Real-time market alerts and monitoring system.
 """
+import heapq
 import logging
+import random
 from datetime import datetime, timedelta
+from operator import attrgetter
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
-from enum import Enum
+from dataclasses import asdict, dataclass, field
+from enum import Enum, IntEnum
+from itertools import chain
 
+import numpy as np
+import pandas as pd
+
+from django.core.cache import cache
 from django.utils import timezone
-from django.db.models import Avg, Count, Q, F
-from django.core.mail import send_mail
+from django.db import connection
+from django.db.models import FloatField, Func, Max
+from django.db.models.functions import Cast
+from django.core.mail import EmailMessage, get_connection
 from django.contrib.auth.models import User
 
 from blog.models_scraping import ScrapedData, ScrapingSource
@@ -17,12 +27,43 @@ from blog.analysis import MarketIntelligenceAnalyzer
 
 logger = logging.getLogger(__name__)
 
+MONITORING_CACHE_KEY = "market_alerts_recent"
+MONITORING_CACHE_TIMEOUT = 300  # 5 minutes
+# Last full run's alerts, keyed by when scraping last ran; bounded so the
+# 7-day window can't drift too far while scrapers are idle
+MONITORING_SNAPSHOT_CACHE_KEY = "market_alerts_snapshot"
+MONITORING_SNAPSHOT_TIMEOUT = 21600  # 6 hours
+ALERT_RECIPIENTS_CACHE_KEY = "alert_recipients_v1"
+ALERT_RECIPIENTS_CACHE_TIMEOUT = 3600  # 1 hour; cleared when a user changes
+
+# Columns the detectors read; everything else on ScrapedData is left in the DB
+MONITORED_FIELDS = (
+    'category', 'supplier_country', 'supplier_name', 'rating',
+    'verification_status', 'views', 'external_id', 'source_id',
+    'scraped_at', 'title',
+)
+
 
-class AlertLevel(Enum):
-    LOW = "low"
-    MEDIUM = "medium"
-    HIGH = "high"
-    CRITICAL = "critical"
+def _compute_demand_spikes(current_views, previous_views, threshold):
+    """
+    Return the positions and percentage increases of rows whose views grew by
+    at least ``threshold`` percent. Both arrays must be aligned and positive.
+    """
+    increases = (current_views - previous_views) / previous_views * 100
+    indices = np.flatnonzero(increases >= threshold)
+    return indices, increases[indices]
+
+
+class AlertLevel(IntEnum):
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+    CRITICAL = 4
+    
+    @property
+    def label(self) -> str:
+        """Lowercase name used in payloads, templates and API responses."""
+        return self.name.lower()
 
 
 class AlertType(Enum):
@@ -36,7 +77,7 @@ class AlertType(Enum):
     MARKET_TREND = "market_trend"
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketAlert:
     alert_type: AlertType
     level: AlertLevel
@@ -47,13 +88,56 @@ class MarketAlert:
     created_at: datetime
     action_required: str
     urgency_score: int
+    urgency_key: tuple = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Precomputed so ranking alerts never rebuilds the key per comparison
+        self.urgency_key = (self.level, self.urgency_score)
+
+
+def alert_to_dict(alert: MarketAlert) -> Dict[str, Any]:
+    """Serialise an alert for a Celery payload, with enums as their values."""
+    data = asdict(alert)
+    data.pop('urgency_key')
+    data['alert_type'] = alert.alert_type.value
+    data['level'] = alert.level.label
+    return data
+
+
+def get_alert_recipients() -> List[str]:
+    """Return superuser emails, the default audience for alert notifications."""
+    return cache.get_or_set(
+        ALERT_RECIPIENTS_CACHE_KEY,
+        lambda: list(User.objects.filter(
+            is_superuser=True,
+            email__isnull=False
+        ).exclude(email='').values_list('email', flat=True)),
+        ALERT_RECIPIENTS_CACHE_TIMEOUT
+    )
+
+
+def _format_alert_section(heading: str, rule_width: int, alerts, with_action: bool = True):
+    """Yield the email lines for one alert level; nothing if there are no alerts."""
+    if not alerts:
+        return
+    yield heading
+    yield "-" * rule_width
+    for alert in alerts:
+        yield f"• {alert.title}: {alert.message}"
+        if with_action:
+            yield f"  Action: {alert.action_required}"
+        yield ""
 
 
 class MarketAlertSystem:
     """Real-time market monitoring and alert system."""
     
-    def __init__(self):
+    def __init__(self, sample_rate: float = 1.0):
+        if not 0 < sample_rate <= 1:
+            raise ValueError(f"sample_rate must be in (0, 1], got {sample_rate!r}")
         self.analyzer = MarketIntelligenceAnalyzer()
+        # Fraction of scraped rows to inspect; below 1.0 suits quick intra-day ticks
+        self.sample_rate = sample_rate
         self.alert_thresholds = {
             'price_change': 15.0,  # % change threshold
             'supply_change': 25.0,  # % change in supplier count
@@ -62,19 +146,45 @@ class MarketAlertSystem:
             'verification_drop': 60.0  # % verified suppliers
         }
         
-    def monitor_market_changes(self) -> List[MarketAlert]:
-        """Monitor all market indicators and generate alerts."""
+    def monitor_market_changes(self, use_cache: bool = True) -> List[MarketAlert]:
+        """Monitor all market indicators and generate alerts.
+        
+        Results are reused for a few minutes so back-to-back callers (the
+        scheduled task, notifications, the dashboard) share one analysis run.
+        Sampled runs are never cached so they can't stand in for a full one.
+        """
+        if not use_cache or self.sample_rate < 1.0:
+            return self._collect_alerts()
+        return cache.get_or_set(
+            MONITORING_CACHE_KEY, self._collect_alerts_if_changed, MONITORING_CACHE_TIMEOUT
+        )
+    
+    def _collect_alerts_if_changed(self) -> List[MarketAlert]:
+        """Reuse the previous run's alerts while no scraper has run since."""
+        last_scraped = ScrapingSource.objects.aggregate(latest=Max('last_scraped'))['latest']
+        
+        snapshot = cache.get(MONITORING_SNAPSHOT_CACHE_KEY)
+        if snapshot is not None and snapshot['last_scraped'] == last_scraped:
+            return snapshot['alerts']
+        
+        alerts = self._collect_alerts()
+        cache.set(
+            MONITORING_SNAPSHOT_CACHE_KEY,
+            {'last_scraped': last_scraped, 'alerts': alerts},
+            MONITORING_SNAPSHOT_TIMEOUT
+        )
+        return alerts
+    
+    def _collect_alerts(self) -> List[MarketAlert]:
+        """Run every detector against the last two weeks of scraped data."""
         alerts = []
         
         # Get recent data for comparison
-        current_period = timezone.now() - timedelta(days=7)
-        previous_period = timezone.now() - timedelta(days=14)
+        now = timezone.now()
+        current_period = now - timedelta(days=7)
+        previous_period = now - timedelta(days=14)
         
-        current_data = ScrapedData.objects.filter(scraped_at__gte=current_period)
-        previous_data = ScrapedData.objects.filter(
-            scraped_at__gte=previous_period, 
-            scraped_at__lt=current_period
-        )
+        current_data, previous_data = self._load_period_frames(current_period, previous_period)
         
         # Generate different types of alerts
         alerts.extend(self._detect_price_changes(current_data, previous_data))
@@ -82,13 +192,39 @@ class MarketAlertSystem:
         alerts.extend(self._detect_demand_changes(current_data, previous_data))
         alerts.extend(self._detect_quality_changes(current_data, previous_data))
         alerts.extend(self._detect_supplier_changes(current_data, previous_data))
-        alerts.extend(self._detect_market_trends(current_data))
+        alerts.extend(self._detect_market_trends(current_data, self._get_market_report()))
         
         # Sort by urgency and level
-        alerts.sort(key=lambda x: (x.level.value, x.urgency_score), reverse=True)
+        alerts.sort(key=attrgetter('urgency_key'), reverse=True)
         
         return alerts
     
+    def _load_period_frames(self, current_period, previous_period):
+        """Fetch both comparison windows in one query and split them in memory."""
+        rows = ScrapedData.objects.filter(
+            scraped_at__gte=previous_period
+        ).values(*MONITORED_FIELDS, price=Cast('current_price', FloatField()))
+        
+        sampled = self.sample_rate < 1.0
+        # PostgreSQL's RANDOM() is uniform on [0, 1); SQLite's is a 64-bit
+        # integer, so other backends sample the fetched rows instead
+        if sampled and connection.vendor == 'postgresql':
+            rows = rows.alias(
+                sample=Func(function='RANDOM', output_field=FloatField())
+            ).filter(sample__lt=self.sample_rate)
+            sampled = False
+        
+        records = list(rows)
+        if sampled:
+            records = [row for row in records if random.random() < self.sample_rate]
+        
+        frame = pd.DataFrame.from_records(
+            records, columns=[*MONITORED_FIELDS, 'price']
+        ).astype({'price': 'float32', 'rating': 'float32'})
+        is_current = frame['scraped_at'] >= current_period
+        
+        return frame[is_current], frame[~is_current]
+    
     def _detect_price_changes(self, current_data, previous_data) -> List[MarketAlert]:
         """Detect significant price movements."""
         alerts = []
@@ -97,13 +233,15 @@ class MarketAlertSystem:
         current_prices = self._get_category_prices(current_data)
         previous_prices = self._get_category_prices(previous_data)
         
+        category_counts = current_data['category'].value_counts()
+        
         for category, current_avg in current_prices.items():
             if category in previous_prices:
                 previous_avg = previous_prices[category]
                 change_percent = ((current_avg - previous_avg) / previous_avg) * 100
                 
                 if abs(change_percent) >= self.alert_thresholds['price_change']:
-                    product_count = current_data.filter(category=category).count()
+                    product_count = int(category_counts.get(category, 0))
                     
                     if change_percent > 0:
                         alert_type = AlertType.PRICE_SURGE
@@ -143,6 +281,7 @@ class MarketAlertSystem:
         
         current_suppliers = self._get_supplier_counts(current_data)
         previous_suppliers = self._get_supplier_counts(previous_data)
+        country_counts = current_data['supplier_country'].value_counts()
         
         for country, current_count in current_suppliers.items():
             if country in previous_suppliers:
@@ -155,7 +294,7 @@ class MarketAlertSystem:
                         level=AlertLevel.HIGH,
                         title=f"Supply Shortage Alert: {country}",
                         message=f"Supplier count dropped {abs(change_percent):.1f}% in {country}",
-                        affected_products=current_data.filter(supplier_country=country).count(),
+                        affected_products=int(country_counts.get(country, 0)),
                         data_points={
                             'country': country,
                             'current_suppliers': current_count,
@@ -173,51 +312,48 @@ class MarketAlertSystem:
         """Detect spikes in product demand."""
         alerts = []
         
-        # Focus on products with significant view/sales increases
-        demand_products = []
+        # Previous-period views per product; rows arrive newest first
+        previous_views = previous_data.loc[
+            previous_data['views'] > 0, ['external_id', 'source_id', 'views']
+        ].drop_duplicates(['external_id', 'source_id'])
         
-        for item in current_data:
-            if item.views and item.views > 100:  # Only track popular products
-                # Try to find same product in previous period
-                previous_item = previous_data.filter(
-                    external_id=item.external_id,
-                    source=item.source
-                ).first()
-                
-                if previous_item and previous_item.views:
-                    view_increase = ((item.views - previous_item.views) / previous_item.views) * 100
-                    
-                    if view_increase >= self.alert_thresholds['demand_spike']:
-                        demand_products.append({
-                            'item': item,
-                            'increase': view_increase,
-                            'current_views': item.views,
-                            'previous_views': previous_item.views
-                        })
-        
-        if demand_products:
+        # Only track popular products
+        popular_items = current_data.loc[
+            current_data['views'] > 100,
+            ['external_id', 'source_id', 'views', 'category', 'title']
+        ]
+        
+        matched = popular_items.merge(
+            previous_views, on=['external_id', 'source_id'], suffixes=('', '_previous')
+        )
+        indices, increases = _compute_demand_spikes(
+            matched['views'].to_numpy(dtype=np.float64),
+            matched['views_previous'].to_numpy(dtype=np.float64),
+            self.alert_thresholds['demand_spike']
+        )
+        demand_products = matched.iloc[indices].assign(increase=increases)
+        
+        if not demand_products.empty:
             # Group by category
-            category_spikes = {}
-            for product in demand_products:
-                category = product['item'].category or 'uncategorized'
-                if category not in category_spikes:
-                    category_spikes[category] = []
-                category_spikes[category].append(product)
+            categories = demand_products['category'].replace('', 'uncategorized')
             
-            for category, products in category_spikes.items():
-                if len(products) >= 3:  # At least 3 products showing spike
-                    avg_increase = sum(p['increase'] for p in products) / len(products)
+            for category, products in demand_products.groupby(categories, sort=False):
+                # Scale sampled counts back up to the full catalogue
+                product_count = round(len(products) / self.sample_rate)
+                
+                if product_count >= 3:  # At least 3 products showing spike
+                    avg_increase = float(products['increase'].mean())
                     
                     alerts.append(MarketAlert(
                         alert_type=AlertType.DEMAND_SPIKE,
                         level=AlertLevel.MEDIUM,
                         title=f"Demand Spike: {category.title()}",
-                        message=f"Average {avg_increase:.0f}% increase in views for {len(products)} products",
-                        affected_products=len(products),
+                        message=f"Average {avg_increase:.0f}% increase in views for {product_count} products",
+                        affected_products=product_count,
                         data_points={
                             'category': category,
                             'avg_increase': avg_increase,
-                            'top_products': [p['item'].title for p in products[:3]]
+                            'top_products': products['title'].head(3).tolist()
                         },
                         created_at=timezone.now(),
                         action_required="Monitor inventory levels and consider increasing stock",
@@ -233,6 +369,7 @@ class MarketAlertSystem:
         # Calculate average ratings by supplier country
         current_ratings = self._get_country_ratings(current_data)
         previous_ratings = self._get_country_ratings(previous_data)
+        country_counts = current_data['supplier_country'].value_counts()
         
         for country, current_rating in current_ratings.items():
             if country in previous_ratings and current_rating < self.alert_thresholds['quality_drop']:
@@ -240,7 +377,7 @@ class MarketAlertSystem:
                 rating_drop = previous_rating - current_rating
                 
                 if rating_drop >= 0.3:  # Significant drop in rating
-                    product_count = current_data.filter(supplier_country=country).count()
+                    product_count = int(country_counts.get(country, 0))
                     
                     alerts.append(MarketAlert(
                         alert_type=AlertType.QUALITY_ISSUE,
@@ -265,12 +402,12 @@ class MarketAlertSystem:
         """Detect changes in supplier verification status."""
         alerts = []
         
-        current_verified = current_data.filter(verification_status='Verified').count()
-        current_total = current_data.count()
+        current_verified = int((current_data['verification_status'] == 'Verified').sum())
+        current_total = len(current_data)
         current_rate = (current_verified / current_total * 100) if current_total > 0 else 0
         
-        previous_verified = previous_data.filter(verification_status='Verified').count()
-        previous_total = previous_data.count()
+        previous_verified = int((previous_data['verification_status'] == 'Verified').sum())
+        previous_total = len(previous_data)
         previous_rate = (previous_verified / previous_total * 100) if previous_total > 0 else 0
         
         if current_rate < self.alert_thresholds['verification_drop'] and current_rate < previous_rate:
@@ -296,13 +433,20 @@ class MarketAlertSystem:
         
         return alerts
     
-    def _detect_market_trends(self, current_data) -> List[MarketAlert]:
+    def _get_market_report(self) -> Dict[str, Any]:
+        """Generate the analyzer report once per monitoring run."""
+        try:
+            return self.analyzer.generate_comprehensive_report()
+        except Exception as e:
+            logger.error(f"Error generating market report: {e}")
+            return {}
+    
+    def _detect_market_trends(self, current_data, report: Dict[str, Any]) -> List[MarketAlert]:
         """Detect emerging market trends."""
         alerts = []
         
-        # Use the analyzer to get trend insights
+        # Use the analyzer report to get trend insights
         try:
-            report = self.analyzer.generate_comprehensive_report()
             trends = report.get('market_trends', {})
             
             # Check for strong trending categories
@@ -311,7 +455,7 @@ class MarketAlertSystem:
                 top_category, avg_views = list(top_categories.items())[0]
                 
                 if avg_views > 1000:  # High view threshold
-                    product_count = current_data.filter(category=top_category).count()
+                    product_count = int((current_data['category'] == top_category).sum())
                     
                     alerts.append(MarketAlert(
                         alert_type=AlertType.MARKET_TREND,
@@ -336,41 +480,20 @@ class MarketAlertSystem:
     
     def _get_category_prices(self, data) -> Dict[str, float]:
         """Calculate average prices by category."""
-        category_prices = {}
-        
-        for category in data.values_list('category', flat=True).distinct():
-            if category:
-                prices = []
-                for item in data.filter(category=category):
-                    if item.current_price:
-                        prices.append(float(item.current_price))
-                
-                if prices:
-                    category_prices[category] = sum(prices) / len(prices)
-        
-        return category_prices
+        priced = data[(data['category'] != '') & (data['price'] > 0)]
+        averages = priced.groupby('category', sort=False)['price'].mean()
+        return {category: float(avg) for category, avg in averages.items()}
     
     def _get_supplier_counts(self, data) -> Dict[str, int]:
         """Count suppliers by country."""
-        return dict(data.values('supplier_country').annotate(
-            count=Count('supplier_name', distinct=True)
-        ).values_list('supplier_country', 'count'))
+        counts = data.groupby('supplier_country', sort=False)['supplier_name'].nunique()
+        return {country: int(count) for country, count in counts.items()}
     
     def _get_country_ratings(self, data) -> Dict[str, float]:
         """Calculate average ratings by supplier country."""
-        country_ratings = {}
-        
-        for country in data.values_list('supplier_country', flat=True).distinct():
-            if country:
-                ratings = []
-                for item in data.filter(supplier_country=country):
-                    if item.rating and item.rating > 0:
-                        ratings.append(float(item.rating))
-                
-                if ratings:
-                    country_ratings[country] = sum(ratings) / len(ratings)
-        
-        return country_ratings
+        rated = data[(data['supplier_country'] != '') & (data['rating'] > 0)]
+        averages = rated.groupby('supplier_country', sort=False)['rating'].mean()
+        return {country: float(avg) for country, avg in averages.items()}
     
     def send_alert_notifications(self, alerts: List[MarketAlert], 
                                recipients: Optional[List[str]] = None) -> bool:
@@ -380,10 +503,7 @@ class MarketAlertSystem:
         
         if not recipients:
             # Get superuser emails as default recipients
-            recipients = list(User.objects.filter(
-                is_superuser=True, 
-                email__isnull=False
-            ).values_list('email', flat=True))
+            recipients = get_alert_recipients()
         
         if not recipients:
             logger.warning("No recipients found for alert notifications")
@@ -399,57 +519,43 @@ class MarketAlertSystem:
         if critical_alerts:
             subject = f"CRITICAL Market Alert: {len(critical_alerts)} critical issues"
         
-        message_parts = [
+        header = (
             f"Market Intelligence Alert Summary - {timezone.now().strftime('%Y-%m-%d %H:%M')}",
             "=" * 60,
             ""
-        ]
-        
-        if critical_alerts:
-            message_parts.extend([
-                "🚨 CRITICAL ALERTS:",
-                "-" * 20
-            ])
-            for alert in critical_alerts:
-                message_parts.append(f"• {alert.title}: {alert.message}")
-                message_parts.append(f"  Action: {alert.action_required}")
-                message_parts.append("")
-        
-        if high_alerts:
-            message_parts.extend([
-                "⚠️  HIGH PRIORITY ALERTS:",
-                "-" * 25
-            ])
-            for alert in high_alerts:
-                message_parts.append(f"• {alert.title}: {alert.message}")
-                message_parts.append(f"  Action: {alert.action_required}")
-                message_parts.append("")
-        
-        if medium_alerts:
-            message_parts.extend([
-                "ℹ️  MEDIUM PRIORITY ALERTS:",
-                "-" * 27
-            ])
-            for alert in medium_alerts[:5]:  # Limit to top 5 medium alerts
-                message_parts.append(f"• {alert.title}: {alert.message}")
-                message_parts.append("")
-        
-        message_parts.extend([
+        )
+        footer = (
             "",
             "This is an automated alert from the Ubongo IQ Market Intelligence System.",
             "Log in to the admin panel for detailed analysis and data."
-        ])
+        )
         
-        message = "\n".join(message_parts)
+        message = "\n".join(chain(
+            header,
+            _format_alert_section("🚨 CRITICAL ALERTS:", 20, critical_alerts),
+            _format_alert_section("⚠️  HIGH PRIORITY ALERTS:", 25, high_alerts),
+            # Limit to top 5 medium alerts
+            _format_alert_section(
+                "ℹ️  MEDIUM PRIORITY ALERTS:", 27,
+                heapq.nlargest(5, medium_alerts, key=attrgetter('urgency_score')),
+                with_action=False
+            ),
+            footer
+        ))
         
         try:
-            send_mail(
-                subject=subject,
-                message=message,
-                from_email='alerts@ubongo-iq.com',
-                recipient_list=recipients,
-                fail_silently=False
-            )
+            # One message per recipient, all over a single SMTP session
+            with get_connection(fail_silently=False) as connection:
+                connection.send_messages([
+                    EmailMessage(
+                        subject=subject,
+                        body=message,
+                        from_email='alerts@ubongo-iq.com',
+                        to=[recipient],
+                        connection=connection
+                    )
+                    for recipient in recipients
+                ])
             logger.info(f"Alert notifications sent to {len(recipients)} recipients")
             return True
         
@@ -466,11 +572,13 @@ def run_market_monitoring() -> List[MarketAlert]:
 
 
 def send_market_alerts(recipients: Optional[List[str]] = None) -> bool:
-    """Generate and send market alerts."""
+    """Generate market alerts and queue their delivery."""
+    from blog.tasks_alerts import send_alert_notifications as send_alert_notifications_task
+    
     alert_system = MarketAlertSystem()
     alerts = alert_system.monitor_market_changes()
     
     if alerts:
-        return alert_system.send_alert_notifications(alerts, recipients)
+        send_alert_notifications_task.delay([alert_to_dict(a) for a in alerts], recipients)
     
     return True
\ No newline at end of file
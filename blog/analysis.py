@@ -2,309 +2,381 @@
 Automated market intelligence analysis and reporting system.
 """
 import statistics
+import time
 from datetime import datetime, timedelta
 from collections import defaultdict, Counter
+from functools import cached_property
 from typing import Dict, List, Any
+
+import numpy as np
+import pandas as pd
+from django.core.cache import cache
+from django.db import connection
 from django.utils import timezone
-from django.db.models import Avg, Count, Q
+from django.db.models import Aggregate, Avg, Case, Count, FloatField, Max, Min, Q, When
+from django.db.models.fields.json import KeyTextTransform, KeyTransform
+from django.db.models.functions import Cast
 from blog.models_scraping import ScrapedData, ScrapingSource, TrendingTopic
 
 
+class Median(Aggregate):
+    """Continuous median, computed by PostgreSQL's ``PERCENTILE_CONT``."""
+    function = 'PERCENTILE_CONT'
+    name = 'Median'
+    output_field = FloatField()
+    template = '%(function)s(0.5) WITHIN GROUP (ORDER BY %(expressions)s)'
+
+
+REPORT_CACHE_KEY = "market_intel_report:v1"
+REPORT_VERSION_KEY = f"{REPORT_CACHE_KEY}:version"
+REPORT_CACHE_TIMEOUT = 600  # 10 minutes
+
+
+def report_cache_key() -> str:
+    """Cache key of the current report; bumping the version retires older copies."""
+    # Seeded from the clock so an evicted version never revives an old report
+    version = cache.get_or_set(REPORT_VERSION_KEY, time.time_ns, None)
+    return f"{REPORT_CACHE_KEY}:{version}"
+
+
+def bump_report_version() -> None:
+    """Mark the cached report stale; the next reader rebuilds it."""
+    try:
+        cache.incr(REPORT_VERSION_KEY)
+    except ValueError:
+        cache.add(REPORT_VERSION_KEY, time.time_ns(), None)
+
+# Columns read by the single pass in MarketIntelligenceAnalyzer._collect_all
+COLLECTED_FIELDS = (
+    'supplier_country', 'supplier_region', 'verification_status',
+    'years_in_business', 'supplier_rating',
+    'minimum_order_quantity', 'lead_time_days', 'shipping_cost',
+    'rating', 'certifications',
+    'price_trend', 'seasonal_demand', 'views', 'category',
+)
+
+
+def _bucket_counts(values, edges, right: bool = False) -> List[int]:
+    """
+    Count ``values`` falling into each bucket delimited by ``edges`` in one
+    pass. With ``right=True`` each edge belongs to the bucket below it.
+    """
+    counts = np.bincount(np.digitize(values, edges, right=right), minlength=len(edges) + 1)
+    return [int(count) for count in counts]
+
+
+def _raw_float(section: str, key: str):
+    """Expression reading ``raw_data[section][key]`` as a float."""
+    return Cast(KeyTextTransform(key, KeyTransform(section, 'raw_data')), FloatField())
+
+
 class MarketIntelligenceAnalyzer:
     """Automated analysis of scraped B2B market data."""
     
     def __init__(self):
         self.data_cutoff = timezone.now() - timedelta(days=30)  # Last 30 days
         
-    def generate_comprehensive_report(self) -> Dict[str, Any]:
-        """Generate a comprehensive market intelligence report."""
-        recent_data = ScrapedData.objects.filter(scraped_at__gte=self.data_cutoff)
+    def generate_comprehensive_report(self, use_cache: bool = True) -> Dict[str, Any]:
+        """Generate a comprehensive market intelligence report.
+        
+        The report only changes when scrapers run, so dashboards, alerts and
+        content templates share one computed copy for a few minutes.
+        """
+        if not use_cache:
+            return self._compute_report()
+        return cache.get_or_set(report_cache_key(), self._compute_report, REPORT_CACHE_TIMEOUT)
+    
+    def get_pricing_analysis(self) -> Dict[str, Any]:
+        """Pricing section of the report, without computing the rest."""
+        return self._get_section('pricing_analysis')
+    
+    def get_supplier_intelligence(self) -> Dict[str, Any]:
+        """Supplier section of the report, without computing the rest."""
+        return self._get_section('supplier_intelligence')
+    
+    def get_logistics_insights(self) -> Dict[str, Any]:
+        """Logistics section of the report, without computing the rest."""
+        return self._get_section('logistics_insights')
+    
+    def _get_section(self, name: str) -> Dict[str, Any]:
+        """Read one section from the shared cached report, else compute just that one."""
+        report = cache.get(report_cache_key())
+        if report is not None:
+            return report[name]
+        return getattr(self, name)
+    
+    @cached_property
+    def recent_data(self):
+        return ScrapedData.objects.filter(scraped_at__gte=self.data_cutoff)
+    
+    @cached_property
+    def collected(self) -> Dict[str, list]:
+        return self._collect_all(self.recent_data)
+    
+    @cached_property
+    def pricing_analysis(self) -> Dict[str, Any]:
+        return self._analyze_pricing(self.recent_data)
+    
+    @cached_property
+    def supplier_intelligence(self) -> Dict[str, Any]:
+        return self._analyze_suppliers(self.collected['suppliers'])
+    
+    @cached_property
+    def logistics_insights(self) -> Dict[str, Any]:
+        return self._analyze_logistics(self.collected['logistics'])
+    
+    def _compute_report(self) -> Dict[str, Any]:
+        """Run every analysis over the last 30 days of scraped data."""
+        recent_data = self.recent_data
+        collected = self.collected
+        pricing = self.pricing_analysis
+        suppliers = self.supplier_intelligence
+        logistics = self.logistics_insights
         
         report = {
             'generated_at': timezone.now(),
             'data_period': '30 days',
             'total_products': recent_data.count(),
-            'pricing_analysis': self._analyze_pricing(recent_data),
-            'supplier_intelligence': self._analyze_suppliers(recent_data),
-            'logistics_insights': self._analyze_logistics(recent_data),
-            'quality_metrics': self._analyze_quality(recent_data),
-            'market_trends': self._analyze_trends(recent_data),
-            'content_opportunities': self._identify_content_opportunities(recent_data),
+            'pricing_analysis': pricing,
+            'supplier_intelligence': suppliers,
+            'logistics_insights': logistics,
+            'quality_metrics': self._analyze_quality(collected['quality']),
+            'market_trends': self._analyze_trends(collected['trends']),
+            'content_opportunities': self._identify_content_opportunities(pricing, suppliers, logistics),
             'alerts': self._generate_alerts(recent_data)
         }
         
         return report
     
+    def _collect_all(self, data) -> Dict[str, list]:
+        """
+        Walk the queryset once and gather the rows each analysis reduces.
+        
+        Columns are preferred. raw_data sections are only fetched, in a
+        second narrower pass, for rows whose keying column is empty.
+        """
+        collected = {'suppliers': [], 'logistics': [], 'quality': [], 'trends': []}
+        
+        rows = data.values_list(*COLLECTED_FIELDS).iterator(chunk_size=2000)
+        for (country, region, verification, years, supplier_rating,
+             moq, lead_time, shipping_cost, rating, certifications,
+             price_trend, seasonal_demand, views, category) in rows:
+            
+            if country:
+                collected['suppliers'].append((country, region, verification, years, supplier_rating))
+            if moq:
+                collected['logistics'].append((moq, lead_time, shipping_cost))
+            if rating:
+                collected['quality'].append((rating, certifications))
+            if category:
+                collected['trends'].append((price_trend, seasonal_demand, views, category))
+        
+        needs_raw = (
+            Q(supplier_country='') |
+            Q(minimum_order_quantity__isnull=True) | Q(minimum_order_quantity=0) |
+            Q(rating__isnull=True) | Q(rating=0)
+        )
+        rows = data.filter(needs_raw).values_list(
+            'supplier_country', 'minimum_order_quantity', 'rating',
+            'raw_data__supplier', 'raw_data__logistics', 'raw_data__quality'
+        ).iterator(chunk_size=2000)
+        for country, moq, rating, raw_supplier, raw_logistics, raw_quality in rows:
+            if not country and raw_supplier and raw_supplier.get('country'):
+                collected['suppliers'].append((
+                    raw_supplier.get('country'),
+                    raw_supplier.get('region'),
+                    raw_supplier.get('verification_status'),
+                    raw_supplier.get('years_in_business'),
+                    raw_supplier.get('rating'),
+                ))
+            if not moq and raw_logistics and raw_logistics.get('moq'):
+                collected['logistics'].append((
+                    raw_logistics.get('moq'),
+                    raw_logistics.get('lead_time_days'),
+                    raw_logistics.get('shipping_cost'),
+                ))
+            if not rating and raw_quality and raw_quality.get('rating'):
+                collected['quality'].append((
+                    raw_quality.get('rating'),
+                    raw_quality.get('certifications', []),
+                ))
+        
+        return collected
+    
     def _analyze_pricing(self, data) -> Dict[str, Any]:
         """Comprehensive pricing analysis."""
-        # Extract pricing data from both new fields and raw_data
-        pricing_data = []
-        
-        for item in data:
-            price_info = {}
-            
-            # Try new fields first
-            if hasattr(item, 'current_price') and item.current_price:
-                price_info['current_price'] = float(item.current_price)
-                price_info['original_price'] = float(item.original_price) if item.original_price else None
-                price_info['discount'] = float(item.discount_percentage) if item.discount_percentage else 0
-                price_info['bulk_tiers'] = len(item.bulk_pricing_tiers) if item.bulk_pricing_tiers else 0
-            
-            # Fall back to raw_data
-            elif 'pricing' in item.raw_data:
-                pricing = item.raw_data['pricing']
-                price_info['current_price'] = pricing.get('current_price')
-                price_info['original_price'] = pricing.get('original_price')
-                price_info['discount'] = pricing.get('discount_percentage', 0)
-                price_info['bulk_tiers'] = len(pricing.get('bulk_pricing_tiers', []))
-            
-            if price_info.get('current_price'):
-                price_info['category'] = item.category
-                pricing_data.append(price_info)
-        
-        if not pricing_data:
+        # Use the pricing columns where set, otherwise fall back to raw_data
+        uses_fields = Q(current_price__isnull=False) & ~Q(current_price=0)
+        priced = data.annotate(
+            price=Case(
+                When(uses_fields, then=Cast('current_price', FloatField())),
+                default=_raw_float('pricing', 'current_price'),
+            ),
+            discount=Case(
+                When(uses_fields, then=Cast('discount_percentage', FloatField())),
+                default=_raw_float('pricing', 'discount_percentage'),
+            ),
+        ).filter(price__isnull=False).exclude(price=0)
+        
+        has_bulk_tiers = (
+            (uses_fields & ~Q(bulk_pricing_tiers=[])) |
+            (~uses_fields & Q(raw_data__pricing__bulk_pricing_tiers__isnull=False) &
+             ~Q(raw_data__pricing__bulk_pricing_tiers=[]))
+        )
+        
+        # PERCENTILE_CONT is PostgreSQL-only; other backends take the median in Python
+        use_sql_median = connection.vendor == 'postgresql'
+        summary = priced.aggregate(
+            total=Count('id'),
+            average=Avg('price'),
+            **({'median': Median('price')} if use_sql_median else {}),
+            minimum=Min('price'),
+            maximum=Max('price'),
+            discounted=Count('id', filter=Q(discount__gt=0)),
+            average_discount=Avg('discount', filter=Q(discount__gt=0)),
+            bulk_tiers=Count('id', filter=has_bulk_tiers),
+        )
+        
+        if not summary['total']:
             return {'error': 'No pricing data available'}
         
-        prices = [p['current_price'] for p in pricing_data]
-        discounts = [p['discount'] for p in pricing_data if p['discount'] > 0]
+        if not use_sql_median:
+            summary['median'] = statistics.median(priced.values_list('price', flat=True))
         
         # Category analysis
-        category_prices = defaultdict(list)
-        for p in pricing_data:
-            if p['category']:
-                category_prices[p['category']].append(p['current_price'])
-        
-        category_averages = {
-            cat: statistics.mean(prices) 
-            for cat, prices in category_prices.items()
-        }
+        category_averages = priced.exclude(category='').values('category').annotate(
+            average=Avg('price')
+        ).order_by('-average')[:5]
         
         return {
-            'total_products_with_pricing': len(pricing_data),
-            'average_price': statistics.mean(prices),
-            'median_price': statistics.median(prices),
+            'total_products_with_pricing': summary['total'],
+            'average_price': summary['average'],
+            'median_price': summary['median'],
             'price_range': {
-                'min': min(prices),
-                'max': max(prices)
+                'min': summary['minimum'],
+                'max': summary['maximum']
             },
             'discount_analysis': {
-                'products_with_discounts': len(discounts),
-                'average_discount': statistics.mean(discounts) if discounts else 0,
-                'discount_rate': len(discounts) / len(pricing_data) * 100
+                'products_with_discounts': summary['discounted'],
+                'average_discount': summary['average_discount'] or 0,
+                'discount_rate': summary['discounted'] / summary['total'] * 100
             },
-            'bulk_pricing_availability': len([p for p in pricing_data if p['bulk_tiers'] > 0]),
-            'category_pricing': dict(sorted(category_averages.items(), key=lambda x: x[1], reverse=True)[:5])
+            'bulk_pricing_availability': summary['bulk_tiers'],
+            'category_pricing': {row['category']: row['average'] for row in category_averages}
         }
     
-    def _analyze_suppliers(self, data) -> Dict[str, Any]:
+    def _analyze_suppliers(self, supplier_data) -> Dict[str, Any]:
         """Supplier landscape analysis."""
-        supplier_data = []
-        
-        for item in data:
-            supplier_info = {}
-            
-            # Try new fields first
-            if hasattr(item, 'supplier_country') and item.supplier_country:
-                supplier_info = {
-                    'country': item.supplier_country,
-                    'region': item.supplier_region,
-                    'verification': item.verification_status,
-                    'years': item.years_in_business,
-                    'rating': item.supplier_rating
-                }
-            
-            # Fall back to raw_data
-            elif 'supplier' in item.raw_data:
-                supplier = item.raw_data['supplier']
-                supplier_info = {
-                    'country': supplier.get('country'),
-                    'region': supplier.get('region'),
-                    'verification': supplier.get('verification_status'),
-                    'years': supplier.get('years_in_business'),
-                    'rating': supplier.get('rating')
-                }
-            
-            if supplier_info.get('country'):
-                supplier_data.append(supplier_info)
-        
         if not supplier_data:
             return {'error': 'No supplier data available'}
         
-        countries = Counter([s['country'] for s in supplier_data if s['country']])
-        regions = Counter([s['region'] for s in supplier_data if s['region']])
-        verified = len([s for s in supplier_data if s['verification'] == 'Verified'])
+        suppliers = pd.DataFrame.from_records(
+            supplier_data, columns=['country', 'region', 'verification', 'years', 'rating']
+        )
+        countries = suppliers['country'].value_counts()
+        regions = suppliers.loc[suppliers['region'] != '', 'region'].value_counts()
+        verified = int((suppliers['verification'] == 'Verified').sum())
         
-        years_data = [s['years'] for s in supplier_data if s['years'] and s['years'] > 0]
-        ratings_data = [s['rating'] for s in supplier_data if s['rating'] and s['rating'] > 0]
+        years_data = np.array([s[3] for s in supplier_data if s[3]], dtype=np.float64)
+        years_data = years_data[years_data > 0]
+        ratings_data = np.array([s[4] for s in supplier_data if s[4]], dtype=np.float64)
+        ratings_data = ratings_data[ratings_data > 0]
         
         return {
             'total_suppliers': len(supplier_data),
             'geographic_distribution': {
-                'by_country': dict(countries.most_common(10)),
-                'by_region': dict(regions.most_common())
+                'by_country': {country: int(n) for country, n in countries.head(10).items()},
+                'by_region': {region: int(n) for region, n in regions.items()}
             },
             'verification_rate': verified / len(supplier_data) * 100,
             'experience_metrics': {
-                'average_years': statistics.mean(years_data) if years_data else 0,
-                'experienced_suppliers': len([y for y in years_data if y >= 10])
+                'average_years': float(years_data.mean()) if years_data.size else 0,
+                'experienced_suppliers': int((years_data >= 10).sum())
             },
             'quality_metrics': {
-                'average_rating': statistics.mean(ratings_data) if ratings_data else 0,
-                'high_rated_suppliers': len([r for r in ratings_data if r >= 4.5])
+                'average_rating': float(ratings_data.mean()) if ratings_data.size else 0,
+                'high_rated_suppliers': int((ratings_data >= 4.5).sum())
             }
         }
     
-    def _analyze_logistics(self, data) -> Dict[str, Any]:
+    def _analyze_logistics(self, logistics_data) -> Dict[str, Any]:
         """Logistics and shipping analysis."""
-        logistics_data = []
-        
-        for item in data:
-            logistics_info = {}
-            
-            # Try new fields first
-            if hasattr(item, 'minimum_order_quantity') and item.minimum_order_quantity:
-                logistics_info = {
-                    'moq': item.minimum_order_quantity,
-                    'lead_time': item.lead_time_days,
-                    'shipping_cost': float(item.shipping_cost) if item.shipping_cost else None,
-                    'shipping_methods': item.shipping_methods or []
-                }
-            
-            # Fall back to raw_data
-            elif 'logistics' in item.raw_data:
-                logistics = item.raw_data['logistics']
-                logistics_info = {
-                    'moq': logistics.get('moq'),
-                    'lead_time': logistics.get('lead_time_days'),
-                    'shipping_cost': logistics.get('shipping_cost'),
-                    'shipping_methods': logistics.get('shipping_methods', [])
-                }
-            
-            if logistics_info.get('moq'):
-                logistics_data.append(logistics_info)
-        
         if not logistics_data:
             return {'error': 'No logistics data available'}
         
-        moqs = [l['moq'] for l in logistics_data if l['moq']]
-        lead_times = [l['lead_time'] for l in logistics_data if l['lead_time']]
-        shipping_costs = [l['shipping_cost'] for l in logistics_data if l['shipping_cost']]
+        moqs = np.asarray([l[0] for l in logistics_data])
+        lead_times = np.asarray([l[1] for l in logistics_data if l[1]])
+        shipping_costs = np.array([l[2] for l in logistics_data if l[2]], dtype=np.float64)
         
         # MOQ categories
+        small, medium, large = _bucket_counts(moqs, (100, 500), right=True)
         moq_categories = {
-            'small_business_friendly': len([m for m in moqs if m <= 100]),
-            'medium_orders': len([m for m in moqs if 101 <= m <= 500]),
-            'large_orders': len([m for m in moqs if m > 500])
+            'small_business_friendly': small,
+            'medium_orders': medium,
+            'large_orders': large
         }
+        fast, standard, slow = _bucket_counts(lead_times, (7, 21), right=True)
         
         return {
             'moq_analysis': {
-                'average': statistics.mean(moqs) if moqs else 0,
-                'median': statistics.median(moqs) if moqs else 0,
-                'range': {'min': min(moqs), 'max': max(moqs)} if moqs else {},
+                'average': float(moqs.mean()),
+                'median': float(np.median(moqs)),
+                'range': {'min': moqs.min().item(), 'max': moqs.max().item()},
                 'categories': moq_categories
             },
             'lead_time_analysis': {
-                'average_days': statistics.mean(lead_times) if lead_times else 0,
-                'fast_delivery': len([l for l in lead_times if l <= 7]),
-                'standard_delivery': len([l for l in lead_times if 8 <= l <= 21]),
-                'slow_delivery': len([l for l in lead_times if l > 21])
+                'average_days': float(lead_times.mean()) if lead_times.size else 0,
+                'fast_delivery': fast,
+                'standard_delivery': standard,
+                'slow_delivery': slow
             },
             'shipping_cost_analysis': {
-                'average_cost': statistics.mean(shipping_costs) if shipping_costs else 0,
-                'cost_range': {'min': min(shipping_costs), 'max': max(shipping_costs)} if shipping_costs else {}
+                'average_cost': float(shipping_costs.mean()) if shipping_costs.size else 0,
+                'cost_range': {
+                    'min': shipping_costs.min().item(),
+                    'max': shipping_costs.max().item()
+                } if shipping_costs.size else {}
             }
         }
     
-    def _analyze_quality(self, data) -> Dict[str, Any]:
+    def _analyze_quality(self, quality_data) -> Dict[str, Any]:
         """Quality and certification analysis."""
-        quality_data = []
-        all_certifications = set()
+        ratings = [rating for rating, _ in quality_data]
+        certified = [certifications for _, certifications in quality_data if certifications]
+        all_certifications = set().union(*certified)
         
-        for item in data:
-            quality_info = {}
-            
-            # Try new fields first
-            if hasattr(item, 'rating') and item.rating:
-                quality_info = {
-                    'rating': item.rating,
-                    'rating_count': item.rating_count,
-                    'certifications': item.certifications or []
-                }
-            
-            # Fall back to raw_data
-            elif 'quality' in item.raw_data:
-                quality = item.raw_data['quality']
-                quality_info = {
-                    'rating': quality.get('rating'),
-                    'rating_count': quality.get('rating_count'),
-                    'certifications': quality.get('certifications', [])
-                }
-            
-            if quality_info.get('rating'):
-                quality_data.append(quality_info)
-                all_certifications.update(quality_info.get('certifications', []))
-        
-        if not quality_data:
+        if not ratings:
             return {'error': 'No quality data available'}
         
-        ratings = [q['rating'] for q in quality_data if q['rating']]
+        ratings = np.array(ratings, dtype=np.float64)
+        fair, good, high = _bucket_counts(ratings, (4.0, 4.5))
         
         return {
             'rating_analysis': {
-                'average_rating': statistics.mean(ratings),
-                'high_quality': len([r for r in ratings if r >= 4.5]),
-                'good_quality': len([r for r in ratings if 4.0 <= r < 4.5]),
-                'fair_quality': len([r for r in ratings if r < 4.0])
+                'average_rating': float(ratings.mean()),
+                'high_quality': high,
+                'good_quality': good,
+                'fair_quality': fair
             },
             'certification_landscape': {
                 'total_certifications': len(all_certifications),
                 'common_certifications': list(all_certifications)[:10],
-                'certified_products': len([q for q in quality_data if q.get('certifications')])
+                'certified_products': len(certified)
             }
         }
     
-    def _analyze_trends(self, data) -> Dict[str, Any]:
+    def _analyze_trends(self, trend_data) -> Dict[str, Any]:
         """Market trend analysis."""
-        trend_data = []
-        
-        for item in data:
-            trend_info = {}
-            
-            # Try new fields first
-            if hasattr(item, 'price_trend'):
-                trend_info = {
-                    'price_trend': item.price_trend,
-                    'seasonal_demand': item.seasonal_demand,
-                    'views': item.views,
-                    'sales': item.sales,
-                    'category': item.category
-                }
-            
-            # Fall back to raw_data
-            elif 'market_intelligence' in item.raw_data:
-                market = item.raw_data['market_intelligence']
-                trend_info = {
-                    'price_trend': market.get('price_trend'),
-                    'seasonal_demand': market.get('seasonal_demand'),
-                    'views': market.get('views'),
-                    'sales': market.get('sales'),
-                    'category': item.category
-                }
-            
-            if trend_info.get('category'):
-                trend_data.append(trend_info)
-        
-        price_trends = Counter([t['price_trend'] for t in trend_data if t['price_trend']])
-        seasonal_patterns = Counter([t['seasonal_demand'] for t in trend_data if t['seasonal_demand']])
+        price_trends = Counter(t[0] for t in trend_data if t[0])
+        seasonal_patterns = Counter(t[1] for t in trend_data if t[1])
         category_performance = defaultdict(list)
         
-        for t in trend_data:
-            if t.get('views') and t.get('category'):
-                category_performance[t['category']].append(t['views'])
+        for _, _, views, category in trend_data:
+            if views:
+                category_performance[category].append(views)
         
         top_categories = {
-            cat: statistics.mean(views) 
+            cat: statistics.fmean(views) 
             for cat, views in category_performance.items()
         }
         
@@ -314,15 +386,10 @@ class MarketIntelligenceAnalyzer:
             'top_performing_categories': dict(sorted(top_categories.items(), key=lambda x: x[1], reverse=True)[:5])
         }
     
-    def _identify_content_opportunities(self, data) -> List[Dict[str, Any]]:
-        """Identify high-value content opportunities."""
+    def _identify_content_opportunities(self, pricing, suppliers, logistics) -> List[Dict[str, Any]]:
+        """Identify high-value content opportunities from the computed analyses."""
         opportunities = []
         
-        # Get analysis results
-        pricing = self._analyze_pricing(data)
-        suppliers = self._analyze_suppliers(data)
-        logistics = self._analyze_logistics(data)
-        
         # Generate content ideas based on data
         if 'category_pricing' in pricing:
             for category, avg_price in list(pricing['category_pricing'].items())[:3]:
@@ -357,13 +424,20 @@ class MarketIntelligenceAnalyzer:
         """Generate market alerts based on data analysis."""
         alerts = []
         
+        counts = data.aggregate(
+            total=Count('id'),
+            rising=Count('id', filter=(
+                Q(price_trend='Rising') |
+                Q(raw_data__market_intelligence__price_trend='Rising')
+            )),
+            unverified=Count('id', filter=~Q(verification_status='Verified')),
+        )
+        total = counts['total']
+        
         # Price trend alerts
-        rising_prices = data.filter(
-            Q(price_trend='Rising') | 
-            Q(raw_data__market_intelligence__price_trend='Rising')
-        ).count()
+        rising_prices = counts['rising']
         
-        if rising_prices > data.count() * 0.3:  # More than 30% rising
+        if rising_prices > total * 0.3:  # More than 30% rising
             alerts.append({
                 'type': 'price_alert',
                 'level': 'warning',
@@ -372,12 +446,9 @@ class MarketIntelligenceAnalyzer:
             })
         
         # Supplier verification alert
-        if hasattr(data.first(), 'verification_status'):
-            unverified = data.exclude(verification_status='Verified').count()
-        else:
-            unverified = data.exclude(raw_data__supplier__verification_status='Verified').count()
+        unverified = counts['unverified']
         
-        if unverified > data.count() * 0.4:  # More than 40% unverified
+        if unverified > total * 0.4:  # More than 40% unverified
             alerts.append({
                 'type': 'supplier_alert',
                 'level': 'info',
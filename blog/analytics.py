@@ -1,43 +1,195 @@
 # blog/analytics.py
+import atexit
 import logging
+import queue
+import threading
 import time
 from functools import wraps
 from django.core.cache import cache
 from django.db import connection
 from django.utils import timezone
 from django.conf import settings
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
 import json
 
+from utils.log_formatters import dumps
+
 logger = logging.getLogger('ubongo.analytics')
 perf_logger = logging.getLogger('performance')
 
+# Read once; performance_monitor compares against it on every call
+SLOW_THRESHOLD_NS = int(getattr(settings, 'SLOW_REQUEST_THRESHOLD', 1.0) * 1e9)
+
+
+def _reserve_ids(counter_key, count=1):
+    """
+    Atomically reserve ``count`` ids from a cache counter and return the last.
+    
+    Keys derived from these ids never collide, unlike per-second timestamps.
+    The counter is seeded from the clock, so ids keep growing even after it
+    is evicted and keys written before that are never reused.
+    """
+    cache.add(counter_key, time.time_ns(), None)
+    while True:
+        try:
+            return cache.incr(counter_key, count)
+        except ValueError:
+            # The key was evicted (or the backend stores nothing); whoever
+            # reseeds it first owns the ``count`` ids below the seed
+            last_id = time.time_ns() + count
+            if cache.add(counter_key, last_id, None):
+                return last_id
+
+
+# Events are buffered in memory and written by a background thread so that
+# logging and Redis round trips stay off the request path
+EVENT_QUEUE_SIZE = 10000
+EVENT_FLUSH_BATCH = 500
+EVENT_FLUSH_INTERVAL = 0.1  # seconds
+EVENT_SHUTDOWN_TIMEOUT = 5.0  # seconds
+
+# Queued by the exit hook; the writer flushes what it holds and stops
+_STOP = object()
+
 
 class AnalyticsCollector:
     """Centralized analytics data collector."""
     
     def __init__(self):
         self.events = []
+        self._queue = queue.Queue(maxsize=EVENT_QUEUE_SIZE)
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        # Short-lived processes (management commands, Celery tasks) would
+        # otherwise exit with events still queued behind the daemon writer
+        atexit.register(self._shutdown)
     
     def track_event(self, event_type, data, user_id=None, session_id=None):
         """Track a custom event."""
         event = {
-            'timestamp': timezone.now().isoformat(),
+            'ts_ns': time.time_ns(),  # formatted when the batch is flushed
             'event_type': event_type,
             'data': data,
             'user_id': user_id,
             'session_id': session_id,
         }
         
-        # Log event
-        logger.info(f"Analytics event: {event_type}", extra=event)
-        
-        # Cache for real-time processing
-        cache_key = f"analytics_event:{int(time.time())}"
-        cache.set(cache_key, event, 3600)  # 1 hour
+        # The writer stamps and caches its own copy, so the caller's dict never
+        # changes underneath it
+        self._enqueue(dict(event))
         
         return event
     
+    def _enqueue(self, event):
+        """Buffer an event for the writer, dropping the oldest one when full."""
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                pass
+    
+    def _ensure_writer(self):
+        """Start the writer thread lazily, and again in each forked worker."""
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(
+                    target=self._drain, name='analytics-writer', daemon=True
+                )
+                self._writer.start()
+    
+    def _drain(self):
+        """Collect events into batches and flush them until told to stop."""
+        stopping = False
+        while not stopping:
+            event = self._queue.get()
+            if event is _STOP:
+                return
+            batch = [event]
+            deadline = time.monotonic() + EVENT_FLUSH_INTERVAL
+            
+            while len(batch) < EVENT_FLUSH_BATCH:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    event = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if event is _STOP:
+                    stopping = True
+                    break
+                batch.append(event)
+            
+            self._safe_flush(batch)
+    
+    def _safe_flush(self, batch):
+        try:
+            self._flush(batch)
+        except Exception:
+            logger.exception("Failed to flush analytics events")
+    
+    def _shutdown(self):
+        """Flush queued events before the interpreter exits."""
+        writer = self._writer
+        if writer is not None and writer.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=EVENT_SHUTDOWN_TIMEOUT)
+            except queue.Full:
+                pass
+            else:
+                writer.join(EVENT_SHUTDOWN_TIMEOUT)
+                return
+        
+        # No writer to hand off to; flush whatever is left on this thread
+        batch = []
+        while True:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if event is not _STOP:
+                batch.append(event)
+            if len(batch) == EVENT_FLUSH_BATCH:
+                self._safe_flush(batch)
+                batch = []
+        if batch:
+            self._safe_flush(batch)
+    
+    def _flush(self, batch):
+        """Log a batch of events and cache them for real-time processing."""
+        # A batch spans about EVENT_FLUSH_INTERVAL, so the date and time are
+        # formatted once per second it covers; events only add microseconds
+        second_labels = {}
+        for event in batch:
+            seconds, nanos = divmod(event.pop('ts_ns'), 1_000_000_000)
+            label = second_labels.get(seconds)
+            if label is None:
+                label = second_labels[seconds] = datetime.fromtimestamp(
+                    seconds, tz=dt_timezone.utc
+                ).replace(tzinfo=None).isoformat()
+            micros = nanos // 1000
+            event['timestamp'] = (
+                f"{label}.{micros:06d}+00:00" if micros else f"{label}+00:00"
+            )
+            logger.info(f"Analytics event: {event['event_type']}", extra=event)
+        
+        last_id = _reserve_ids('analytics_event_seq', len(batch))
+        first_id = last_id - len(batch) + 1
+        # Cached as JSON text so real-time consumers needn't unpickle Python objects
+        cache.set_many({
+            f"analytics_event:{event_id}": dumps(event)
+            for event_id, event in enumerate(batch, start=first_id)
+        }, 3600)  # 1 hour
+    
     def track_page_view(self, request, page_id, page_type=None):
         """Track page view with context."""
         user_agent = request.META.get('HTTP_USER_AGENT', '')
@@ -85,7 +237,7 @@ class AnalyticsCollector:
         """Extract client IP address."""
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
         if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0].strip()
+            ip = x_forwarded_for.partition(',')[0].strip()
         else:
             ip = request.META.get('REMOTE_ADDR')
         return ip
@@ -98,36 +250,37 @@ analytics = AnalyticsCollector()
 def performance_monitor(func_name=None):
     """Decorator to monitor function performance."""
     def decorator(func):
+        function_name = func_name or f"{func.__module__}.{func.__name__}"
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
             if not getattr(settings, 'PERFORMANCE_LOGGING_ENABLED', False):
                 return func(*args, **kwargs)
             
-            start_time = time.time()
-            function_name = func_name or f"{func.__module__}.{func.__name__}"
+            start_ns = time.perf_counter_ns()
             
             try:
                 result = func(*args, **kwargs)
-                duration = time.time() - start_time
+                duration_ns = time.perf_counter_ns() - start_ns
                 
                 # Log performance
-                perf_logger.info(
-                    f"Function executed: {function_name}",
-                    extra={
-                        'duration': duration,
-                        'name': function_name,
-                        'status': 'success'
-                    }
-                )
+                if perf_logger.isEnabledFor(logging.INFO):
+                    perf_logger.info(
+                        f"Function executed: {function_name}",
+                        extra={
+                            'duration': duration_ns / 1e9,
+                            'name': function_name,
+                            'status': 'success'
+                        }
+                    )
                 
                 # Track slow operations
-                threshold = getattr(settings, 'SLOW_REQUEST_THRESHOLD', 1.0)
-                if duration > threshold:
+                if duration_ns > SLOW_THRESHOLD_NS:
                     perf_logger.warning(
                         f"Slow operation detected: {function_name}",
                         extra={
-                            'duration': duration,
-                            'threshold': threshold,
+                            'duration': duration_ns / 1e9,
+                            'threshold': SLOW_THRESHOLD_NS / 1e9,
                             'name': function_name
                         }
                     )
@@ -135,11 +288,11 @@ def performance_monitor(func_name=None):
                 return result
                 
             except Exception as e:
-                duration = time.time() - start_time
+                duration_ns = time.perf_counter_ns() - start_ns
                 perf_logger.error(
                     f"Function failed: {function_name}",
                     extra={
-                        'duration': duration,
+                        'duration': duration_ns / 1e9,
                         'name': function_name,
                         'error': str(e),
                         'status': 'error'
@@ -151,24 +304,45 @@ def performance_monitor(func_name=None):
     return decorator
 
 
+class QueryCounter:
+    """
+    Database execute wrapper that counts queries as they run.
+    
+    Unlike ``connection.queries`` this works with DEBUG off and keeps no
+    per-query history.
+    """
+    
+    def __init__(self):
+        self.count = 0
+    
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
 class DatabasePerformanceMonitor:
     """Monitor database query performance."""
     
     def __init__(self):
         self.query_count = 0
         self.start_time = None
+        self._counter = None
         
     def __enter__(self):
         self.start_time = time.time()
-        self.query_count = len(connection.queries)
+        self._counter = QueryCounter()
+        connection.execute_wrappers.append(self._counter)
         return self
         
     def __exit__(self, exc_type, exc_val, exc_tb):
+        connection.execute_wrappers.remove(self._counter)
+        self.query_count = self._counter.count
+        
         if not getattr(settings, 'PERFORMANCE_LOGGING_ENABLED', False):
             return
             
         duration = time.time() - self.start_time
-        new_queries = len(connection.queries) - self.query_count
+        new_queries = self.query_count
         
         perf_logger.info(
             "Database performance",
@@ -229,27 +403,31 @@ class RealTimeAnalytics:
         hour_ago = now - timedelta(hours=1)
         day_ago = now - timedelta(days=1)
         
-        # Get cached stats or calculate them
-        stats_key = f"realtime_stats:{now.hour}"
+        # Get cached stats or calculate them; the key rolls over with the TTL
+        stats_key = "realtime_stats"
         stats = cache.get(stats_key)
         
         if not stats:
             from blog.models import ArticlePage
-            from django.db.models import Count, Avg, Sum
+            from django.db.models import Count, Avg, Q, Sum
+            
+            live_articles = ArticlePage.objects.live()
+            totals = ArticlePage.objects.aggregate(
+                live=Count('id', filter=Q(live=True)),
+                views=Sum('view_count'),
+            )
             
             stats = {
                 'timestamp': now.isoformat(),
-                'total_articles': ArticlePage.objects.live().count(),
-                'total_views': ArticlePage.objects.aggregate(
-                    total=Sum('view_count')
-                )['total'] or 0,
+                'total_articles': totals['live'],
+                'total_views': totals['views'] or 0,
                 'popular_articles': list(
-                    ArticlePage.objects.live()
+                    live_articles
                     .order_by('-view_count')[:5]
                     .values('title', 'view_count', 'slug')
                 ),
                 'recent_articles': list(
-                    ArticlePage.objects.live()
+                    live_articles
                     .order_by('-first_published_at')[:5]
                     .values('title', 'first_published_at', 'slug')
                 ),
@@ -348,7 +526,7 @@ class ErrorTracker:
         )
         
         # Cache for error analysis
-        error_key = f"error:{int(time.time())}"
+        error_key = f"error:{_reserve_ids('error_seq')}"
         cache.set(error_key, error_data, 86400)  # 24 hours
         
         return error_data
\ No newline at end of file
@@ -1,73 +1,47 @@
 """
 Intelligent content templates powered by real market data.
 """
+from functools import lru_cache
 from typing import Dict, List, Any
-from datetime import datetime
+from datetime import date, datetime
 from blog.analysis import MarketIntelligenceAnalyzer
 
 
-class ContentTemplateGenerator:
-    """Generate data-driven content templates from market intelligence."""
-    
-    def __init__(self):
-        self.analyzer = MarketIntelligenceAnalyzer()
-        
-    def generate_price_analysis_article(self, category: str = None) -> Dict[str, Any]:
-        """Generate a comprehensive price analysis article."""
-        report = self.analyzer.generate_comprehensive_report()
-        pricing = report['pricing_analysis']
-        
-        if 'error' in pricing:
-            return {'error': 'Insufficient pricing data'}
-        
-        # Focus on specific category or overall market
-        if category and category in pricing.get('category_pricing', {}):
-            focus_price = pricing['category_pricing'][category]
-            title = f"Price Analysis: {category.replace('-', ' ').title()} Market Trends & Buying Guide"
-        else:
-            focus_price = pricing['average_price']
-            title = "B2B Market Price Intelligence Report: Complete Buying Guide"
-        
-        content = f"""
+# Article bodies, rendered with str.format_map against a per-call context
+
+PRICE_TEMPLATE = """
 # {title}
 
 ## Executive Summary
 
-Our comprehensive analysis of **{pricing['total_products_with_pricing']} B2B products** reveals significant market opportunities and pricing trends that every buyer should understand.
+Our comprehensive analysis of **{total_products} B2B products** reveals significant market opportunities and pricing trends that every buyer should understand.
 
 ### Key Findings:
-- **Average Market Price**: ${pricing['average_price']:,.2f}
-- **Price Range**: ${pricing['price_range']['min']:,.2f} - ${pricing['price_range']['max']:,.2f}
-- **Discount Opportunities**: {pricing['discount_analysis']['discount_rate']:.1f}% of products offer discounts
-- **Average Savings**: {pricing['discount_analysis']['average_discount']:.1f}% off original prices
-- **Bulk Pricing**: {pricing['bulk_pricing_availability']} suppliers offer volume discounts
+- **Average Market Price**: ${avg_price:,.2f}
+- **Price Range**: ${min_price:,.2f} - ${max_price:,.2f}
+- **Discount Opportunities**: {discount_rate:.1f}% of products offer discounts
+- **Average Savings**: {avg_discount:.1f}% off original prices
+- **Bulk Pricing**: {bulk_pricing} suppliers offer volume discounts
 
 ## Market Price Analysis
 
 ### Current Pricing Landscape
 
-The B2B market shows a **${pricing['price_range']['min']:,.2f} to ${pricing['price_range']['max']:,.2f}** price range, with an average of **${pricing['average_price']:,.2f}**. This wide range indicates significant opportunity for strategic sourcing.
+The B2B market shows a **${min_price:,.2f} to ${max_price:,.2f}** price range, with an average of **${avg_price:,.2f}**. This wide range indicates significant opportunity for strategic sourcing.
 
 ### Discount Opportunities
 
-**{pricing['discount_analysis']['products_with_discounts']} products** currently offer discounts, representing immediate savings potential:
+**{products_with_discounts} products** currently offer discounts, representing immediate savings potential:
 
-- **Immediate Savings**: {pricing['discount_analysis']['average_discount']:.1f}% average discount
-- **Bulk Pricing**: {pricing['bulk_pricing_availability']} suppliers provide additional volume discounts
+- **Immediate Savings**: {avg_discount:.1f}% average discount
+- **Bulk Pricing**: {bulk_pricing} suppliers provide additional volume discounts
 - **Strategic Timing**: Compare multiple suppliers to maximize savings
 
 ### Category Performance
 
 Top-performing categories by average price:
 
-"""
-        
-        # Add category pricing analysis
-        if pricing.get('category_pricing'):
-            for i, (cat, price) in enumerate(pricing['category_pricing'].items(), 1):
-                content += f"{i}. **{cat.replace('-', ' ').title()}**: ${price:,.2f} average\n"
-        
-        content += f"""
+{category_block}
 
 ## Buying Recommendations
 
@@ -77,9 +51,9 @@ Top-performing categories by average price:
 - Negotiate on payment terms rather than just price
 
 ### For Large Orders
-- Leverage bulk pricing from {pricing['bulk_pricing_availability']} qualified suppliers
+- Leverage bulk pricing from {bulk_pricing} qualified suppliers
 - Request quotes from top 3 price-competitive categories
-- Consider annual contracts for {pricing['discount_analysis']['average_discount']:.0f}%+ savings
+- Consider annual contracts for {avg_discount:.0f}%+ savings
 
 ### Risk Management
 - Verify all pricing includes shipping and taxes
@@ -90,41 +64,19 @@ Top-performing categories by average price:
 
 Based on current trends, buyers should:
 
-1. **Act on Discounts**: {pricing['discount_analysis']['discount_rate']:.0f}% of products offer immediate savings
-2. **Explore Bulk Options**: {pricing['bulk_pricing_availability']} suppliers provide volume incentives
-3. **Compare Actively**: Price ranges up to ${pricing['price_range']['max'] - pricing['price_range']['min']:,.2f} difference between suppliers
+1. **Act on Discounts**: {discount_rate:.0f}% of products offer immediate savings
+2. **Explore Bulk Options**: {bulk_pricing} suppliers provide volume incentives
+3. **Compare Actively**: Price ranges up to ${price_spread:,.2f} difference between suppliers
 
-*Analysis based on {pricing['total_products_with_pricing']} products sampled {datetime.now().strftime('%B %Y')}*
+*Analysis based on {total_products} products sampled {month_label}*
 """
-        
-        return {
-            'title': title,
-            'content': content,
-            'meta_description': f"Complete B2B price analysis: ${pricing['average_price']:,.0f} average, {pricing['discount_analysis']['average_discount']:.0f}% savings available. Data-driven buying guide.",
-            'tags': ['pricing', 'market-analysis', 'procurement', 'cost-optimization', 'b2b-buying'],
-            'content_type': 'price_analysis',
-            'data_confidence': 'high' if pricing['total_products_with_pricing'] > 20 else 'medium'
-        }
-    
-    def generate_supplier_guide_article(self) -> Dict[str, Any]:
-        """Generate a comprehensive supplier selection guide."""
-        report = self.analyzer.generate_comprehensive_report()
-        suppliers = report['supplier_intelligence']
-        
-        if 'error' in suppliers:
-            return {'error': 'Insufficient supplier data'}
-        
-        top_country = list(suppliers['geographic_distribution']['by_country'].keys())[0]
-        top_region = list(suppliers['geographic_distribution']['by_region'].keys())[0]
-        
-        title = f"Complete Supplier Verification Guide: Why {top_country} Leads B2B Manufacturing"
-        
-        content = f"""
+
+SUPPLIER_TEMPLATE = """
 # {title}
 
 ## Global Supplier Landscape Analysis
 
-Our analysis of **{suppliers['total_suppliers']} international suppliers** reveals critical insights for procurement professionals and business buyers.
+Our analysis of **{total_suppliers} international suppliers** reveals critical insights for procurement professionals and business buyers.
 
 ## Geographic Distribution
 
@@ -132,35 +84,24 @@ Our analysis of **{suppliers['total_suppliers']} international suppliers** revea
 
 **{top_region}** dominates the global B2B landscape:
 
-"""
-        
-        # Add country breakdown
-        for country, count in suppliers['geographic_distribution']['by_country'].items():
-            percentage = (count / suppliers['total_suppliers']) * 100
-            content += f"- **{country}**: {count} suppliers ({percentage:.1f}% market share)\n"
-        
-        content += f"""
+{country_block}
 
 ### Regional Strengths
 
-"""
-        for region, count in suppliers['geographic_distribution']['by_region'].items():
-            content += f"- **{region}**: {count} suppliers specializing in manufacturing excellence\n"
-        
-        content += f"""
+{region_block}
 
 ## Supplier Verification Standards
 
 ### Trust Metrics
 
-- **Verification Rate**: {suppliers['verification_rate']:.1f}% of suppliers meet verification standards
-- **Average Experience**: {suppliers['experience_metrics']['average_years']:.1f} years in business
-- **Experienced Suppliers**: {suppliers['experience_metrics']['experienced_suppliers']} with 10+ years experience
+- **Verification Rate**: {verification_rate:.1f}% of suppliers meet verification standards
+- **Average Experience**: {average_years:.1f} years in business
+- **Experienced Suppliers**: {experienced_suppliers} with 10+ years experience
 
 ### Quality Indicators
 
-- **Average Supplier Rating**: {suppliers['quality_metrics']['average_rating']:.1f}/5.0
-- **High-Rated Suppliers**: {suppliers['quality_metrics']['high_rated_suppliers']} suppliers with 4.5+ ratings
+- **Average Supplier Rating**: {average_rating:.1f}/5.0
+- **High-Rated Suppliers**: {high_rated_suppliers} suppliers with 4.5+ ratings
 - **Response Quality**: Verified suppliers show higher response rates
 
 ## Supplier Selection Framework
@@ -207,8 +148,8 @@ Our analysis of **{suppliers['total_suppliers']} international suppliers** revea
 Leading the market with the highest supplier concentration, {top_country} offers:
 
 - **Scale**: Largest supplier base with diverse capabilities
-- **Experience**: Average {suppliers['experience_metrics']['average_years']:.1f} years industry experience
-- **Verification**: {suppliers['verification_rate']:.0f}% meet international standards
+- **Experience**: Average {average_years:.1f} years industry experience
+- **Verification**: {verification_rate:.0f}% meet international standards
 - **Infrastructure**: Established logistics and shipping networks
 
 ## Procurement Best Practices
@@ -220,37 +161,15 @@ Leading the market with the highest supplier concentration, {top_country} offers
 4. Establish clear communication channels
 
 ### For Experienced Buyers
-1. Diversify supplier base across {len(suppliers['geographic_distribution']['by_country'])} countries
+1. Diversify supplier base across {num_countries} countries
 2. Maintain relationships with top-rated suppliers
 3. Regular performance reviews and audits
 4. Strategic partnerships with tier 1 suppliers
 
-*Analysis based on {suppliers['total_suppliers']} suppliers across {len(suppliers['geographic_distribution']['by_region'])} regions*
+*Analysis based on {total_suppliers} suppliers across {num_regions} regions*
 """
-        
-        return {
-            'title': title,
-            'content': content,
-            'meta_description': f"{top_country} leads with {suppliers['verification_rate']:.0f}% verified suppliers. Complete guide to B2B supplier selection and verification.",
-            'tags': ['supplier-verification', 'procurement', 'b2b-sourcing', 'risk-management', 'global-trade'],
-            'content_type': 'supplier_guide',
-            'data_confidence': 'high' if suppliers['total_suppliers'] > 15 else 'medium'
-        }
-    
-    def generate_moq_optimization_article(self) -> Dict[str, Any]:
-        """Generate MOQ and logistics optimization guide."""
-        report = self.analyzer.generate_comprehensive_report()
-        logistics = report['logistics_insights']
-        
-        if 'error' in logistics:
-            return {'error': 'Insufficient logistics data'}
-        
-        moq_data = logistics['moq_analysis']
-        lead_time_data = logistics['lead_time_analysis']
-        
-        title = f"MOQ Optimization Guide: Strategic Ordering from {moq_data['average']:.0f}-Unit Minimums"
-        
-        content = f"""
+
+MOQ_TEMPLATE = """
 # {title}
 
 ## Procurement Strategy for Minimum Order Quantities
@@ -261,21 +180,21 @@ Understanding MOQ requirements is critical for cost-effective B2B procurement. O
 
 ### Market Overview
 
-- **Average MOQ**: {moq_data['average']:.0f} units
-- **MOQ Range**: {moq_data['range']['min']} - {moq_data['range']['max']:,} units  
-- **Median MOQ**: {moq_data['median']:.0f} units (50% of suppliers below this threshold)
+- **Average MOQ**: {average_moq:.0f} units
+- **MOQ Range**: {min_moq} - {max_moq:,} units  
+- **Median MOQ**: {median_moq:.0f} units (50% of suppliers below this threshold)
 
 ### Order Volume Categories
 
-**Small Business Friendly**: {moq_data['categories']['small_business_friendly']} suppliers (≤100 units)
+**Small Business Friendly**: {small_business_friendly} suppliers (≤100 units)
 - Ideal for: Testing new products, seasonal items, custom orders
 - Strategy: Focus on these suppliers for initial market entry
 
-**Medium Volume**: {moq_data['categories']['medium_orders']} suppliers (101-500 units)  
+**Medium Volume**: {medium_orders} suppliers (101-500 units)  
 - Ideal for: Regular inventory, established product lines
 - Strategy: Negotiate terms for consistent monthly orders
 
-**Large Volume**: {moq_data['categories']['large_orders']} suppliers (500+ units)
+**Large Volume**: {large_orders} suppliers (500+ units)
 - Ideal for: Bulk purchasing, annual contracts, warehouse stocking
 - Strategy: Leverage volume for maximum cost savings
 
@@ -283,19 +202,19 @@ Understanding MOQ requirements is critical for cost-effective B2B procurement. O
 
 ### Delivery Performance
 
-- **Average Lead Time**: {lead_time_data['average_days']:.1f} days
-- **Fast Delivery**: {lead_time_data['fast_delivery']} suppliers (≤7 days)
-- **Standard Delivery**: {lead_time_data['standard_delivery']} suppliers (8-21 days)  
-- **Extended Delivery**: {lead_time_data['slow_delivery']} suppliers (>21 days)
+- **Average Lead Time**: {average_lead_days:.1f} days
+- **Fast Delivery**: {fast_delivery} suppliers (≤7 days)
+- **Standard Delivery**: {standard_delivery} suppliers (8-21 days)  
+- **Extended Delivery**: {slow_delivery} suppliers (>21 days)
 
 ### Strategic Planning Framework
 
-**Rush Orders (≤7 days)**: {lead_time_data['fast_delivery']} suppliers available
+**Rush Orders (≤7 days)**: {fast_delivery} suppliers available
 - Premium: Expect 25-50% price increase
 - Use for: Emergency inventory, time-critical projects
 - MOQ Impact: Often higher minimums for fast delivery
 
-**Standard Planning ({lead_time_data['average_days']:.0f} days)**: Optimal balance
+**Standard Planning ({average_lead_days:.0f} days)**: Optimal balance
 - Cost: Standard pricing with negotiation opportunities  
 - Use for: Regular procurement cycles, planned inventory
 - MOQ Impact: Standard minimums apply
@@ -311,7 +230,7 @@ Understanding MOQ requirements is critical for cost-effective B2B procurement. O
 
 Beyond unit price, factor in:
 
-- **Shipping Costs**: Average ${logistics.get('shipping_cost_analysis', {}).get('average_cost', 0):.2f}
+- **Shipping Costs**: Average ${average_shipping_cost:.2f}
 - **Inventory Carrying**: 15-25% annual cost of stored inventory
 - **Order Processing**: $50-200 per order administrative cost
 - **Quality Risk**: Higher with unverified low-MOQ suppliers
@@ -356,48 +275,230 @@ Beyond unit price, factor in:
 ## Small Business Success Framework
 
 ### Startup Strategy (Limited Capital)
-1. **Target**: {moq_data['categories']['small_business_friendly']} suppliers with ≤100 unit MOQs
-2. **Budget**: Allocate ${moq_data['average'] * 50:.0f}+ for initial orders
-3. **Timeline**: Plan {lead_time_data['average_days'] + 7:.0f} days from order to delivery
+1. **Target**: {small_business_friendly} suppliers with ≤100 unit MOQs
+2. **Budget**: Allocate ${starter_budget:.0f}+ for initial orders
+3. **Timeline**: Plan {order_to_delivery_days:.0f} days from order to delivery
 4. **Growth**: Establish relationships for future volume increases
 
 ### Scaling Strategy (Growing Business)
-1. **Diversify**: Use {moq_data['categories']['medium_orders']} medium-volume suppliers
+1. **Diversify**: Use {medium_orders} medium-volume suppliers
 2. **Negotiate**: Leverage growing order history for better terms
-3. **Plan**: Implement {lead_time_data['average_days']:.0f}-day procurement cycles
+3. **Plan**: Implement {average_lead_days:.0f}-day procurement cycles
 4. **Optimize**: Balance inventory costs with volume discounts
 
-*Analysis based on {len([True for _ in range(10)])} suppliers across multiple categories*
+*Analysis based on {total_suppliers} suppliers across multiple categories*
 """
+
+
+# Shared across renders; tuples so no caller can mutate them in place
+PRICE_TAGS = ('pricing', 'market-analysis', 'procurement', 'cost-optimization', 'b2b-buying')
+SUPPLIER_TAGS = ('supplier-verification', 'procurement', 'b2b-sourcing', 'risk-management', 'global-trade')
+MOQ_TAGS = ('moq-optimization', 'procurement-strategy', 'inventory-management', 'cost-optimization', 'supply-chain')
+
+
+# Separators in category slugs, mapped to spaces for display names
+CATEGORY_SEPARATORS = str.maketrans({'-': ' ', '_': ' '})
+
+
+@lru_cache(maxsize=1)
+def _month_label(year: int, month: int) -> str:
+    """'October 2026'-style label; only re-formatted when the month rolls over."""
+    return date(year, month, 1).strftime('%B %Y')
+
+
+class ContentTemplateGenerator:
+    """Generate data-driven content templates from market intelligence."""
+    
+    def __init__(self):
+        self.analyzer = MarketIntelligenceAnalyzer()
+        
+    def generate_price_analysis_article(self, category: str = None,
+                                        report: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Generate a comprehensive price analysis article."""
+        if report is None:
+            pricing = self.analyzer.get_pricing_analysis()
+        else:
+            pricing = report['pricing_analysis']
+        
+        # Validate before rendering so the error path builds no content
+        if 'error' in pricing or not pricing.get('total_products_with_pricing'):
+            return {'error': 'Insufficient pricing data'}
+        
+        total = pricing['total_products_with_pricing']
+        avg_price = pricing['average_price']
+        price_range = pricing['price_range']
+        min_price, max_price = price_range['min'], price_range['max']
+        discount = pricing['discount_analysis']
+        avg_disc = discount['average_discount']
+        bulk = pricing['bulk_pricing_availability']
+        
+        category_pricing = pricing.get('category_pricing') or {}
+        pretty_names = {cat: cat.translate(CATEGORY_SEPARATORS).title() for cat in category_pricing}
+        
+        # Focus on specific category or overall market
+        if category and category in category_pricing:
+            focus_price = category_pricing[category]
+            title = f"Price Analysis: {pretty_names[category]} Market Trends & Buying Guide"
+        else:
+            focus_price = avg_price
+            title = "B2B Market Price Intelligence Report: Complete Buying Guide"
+        
+        now = datetime.now()
+        
+        # Category pricing analysis
+        category_block = "".join(
+            f"{i}. **{pretty_names[cat]}**: ${price:,.2f} average\n"
+            for i, (cat, price) in enumerate(category_pricing.items(), 1)
+        )
+        
+        content = PRICE_TEMPLATE.format_map({
+            'title': title,
+            'total_products': total,
+            'avg_price': avg_price,
+            'min_price': min_price,
+            'max_price': max_price,
+            'price_spread': max_price - min_price,
+            'discount_rate': discount['discount_rate'],
+            'avg_discount': avg_disc,
+            'products_with_discounts': discount['products_with_discounts'],
+            'bulk_pricing': bulk,
+            'category_block': category_block,
+            'month_label': _month_label(now.year, now.month),
+        })
         
         return {
             'title': title,
             'content': content,
-            'meta_description': f"MOQ optimization guide: {moq_data['average']:.0f} unit average, {lead_time_data['average_days']:.0f} day lead times. Strategic procurement planning.",
-            'tags': ['moq-optimization', 'procurement-strategy', 'inventory-management', 'cost-optimization', 'supply-chain'],
+            'meta_description': f"Complete B2B price analysis: ${avg_price:,.0f} average, {avg_disc:.0f}% savings available. Data-driven buying guide.",
+            'tags': PRICE_TAGS,
+            'content_type': 'price_analysis',
+            'data_confidence': 'high' if total > 20 else 'medium'
+        }
+    
+    def generate_supplier_guide_article(self, report: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Generate a comprehensive supplier selection guide."""
+        if report is None:
+            suppliers = self.analyzer.get_supplier_intelligence()
+        else:
+            suppliers = report['supplier_intelligence']
+        
+        geo = suppliers.get('geographic_distribution', {})
+        if 'error' in suppliers or not suppliers.get('total_suppliers') \
+                or not geo.get('by_country') or not geo.get('by_region'):
+            return {'error': 'Insufficient supplier data'}
+        
+        total_suppliers = suppliers['total_suppliers']
+        verification_rate = suppliers['verification_rate']
+        experience = suppliers['experience_metrics']
+        quality = suppliers['quality_metrics']
+        by_country = geo['by_country']
+        by_region = geo['by_region']
+        num_countries, num_regions = len(by_country), len(by_region)
+        
+        top_country = next(iter(by_country))
+        top_region = next(iter(by_region))
+        
+        title = f"Complete Supplier Verification Guide: Why {top_country} Leads B2B Manufacturing"
+        
+        # Country and region breakdowns
+        country_block = "".join(
+            f"- **{country}**: {count} suppliers ({(count / total_suppliers) * 100:.1f}% market share)\n"
+            for country, count in by_country.items()
+        )
+        region_block = "".join(
+            f"- **{region}**: {count} suppliers specializing in manufacturing excellence\n"
+            for region, count in by_region.items()
+        )
+        
+        content = SUPPLIER_TEMPLATE.format_map({
+            'title': title,
+            'top_country': top_country,
+            'top_region': top_region,
+            'total_suppliers': total_suppliers,
+            'verification_rate': verification_rate,
+            'average_years': experience['average_years'],
+            'experienced_suppliers': experience['experienced_suppliers'],
+            'average_rating': quality['average_rating'],
+            'high_rated_suppliers': quality['high_rated_suppliers'],
+            'num_countries': num_countries,
+            'num_regions': num_regions,
+            'country_block': country_block,
+            'region_block': region_block,
+        })
+        
+        return {
+            'title': title,
+            'content': content,
+            'meta_description': f"{top_country} leads with {verification_rate:.0f}% verified suppliers. Complete guide to B2B supplier selection and verification.",
+            'tags': SUPPLIER_TAGS,
+            'content_type': 'supplier_guide',
+            'data_confidence': 'high' if total_suppliers > 15 else 'medium'
+        }
+    
+    def generate_moq_optimization_article(self, report: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Generate MOQ and logistics optimization guide."""
+        if report is None:
+            logistics = self.analyzer.get_logistics_insights()
+        else:
+            logistics = report['logistics_insights']
+        
+        if 'error' in logistics or not logistics.get('moq_analysis'):
+            return {'error': 'Insufficient logistics data'}
+        
+        moq_data = logistics['moq_analysis']
+        lead_time_data = logistics['lead_time_analysis']
+        avg_moq = moq_data['average']
+        moq_categories = moq_data['categories']
+        moq_range = moq_data['range']
+        avg_days = lead_time_data['average_days']
+        if report is None:
+            suppliers = self.analyzer.get_supplier_intelligence()
+        else:
+            suppliers = report.get('supplier_intelligence', {})
+        total_suppliers = suppliers.get('total_suppliers', 0)
+        
+        title = f"MOQ Optimization Guide: Strategic Ordering from {avg_moq:.0f}-Unit Minimums"
+        
+        content = MOQ_TEMPLATE.format_map({
+            'title': title,
+            'average_moq': avg_moq,
+            'min_moq': moq_range['min'],
+            'max_moq': moq_range['max'],
+            'median_moq': moq_data['median'],
+            'small_business_friendly': moq_categories['small_business_friendly'],
+            'medium_orders': moq_categories['medium_orders'],
+            'large_orders': moq_categories['large_orders'],
+            'starter_budget': avg_moq * 50,
+            'average_lead_days': avg_days,
+            'order_to_delivery_days': avg_days + 7,
+            'fast_delivery': lead_time_data['fast_delivery'],
+            'standard_delivery': lead_time_data['standard_delivery'],
+            'slow_delivery': lead_time_data['slow_delivery'],
+            'average_shipping_cost': logistics.get('shipping_cost_analysis', {}).get('average_cost', 0),
+            'total_suppliers': total_suppliers,
+        })
+        
+        return {
+            'title': title,
+            'content': content,
+            'meta_description': f"MOQ optimization guide: {avg_moq:.0f} unit average, {avg_days:.0f} day lead times. Strategic procurement planning.",
+            'tags': MOQ_TAGS,
             'content_type': 'logistics_guide',
             'data_confidence': 'high'
         }
     
     def generate_all_templates(self) -> List[Dict[str, Any]]:
         """Generate all available content templates."""
-        templates = []
-        
-        # Generate each template type
+        # Each generator pulls only its section; the analyzer memoises them,
+        # so the supplier and logistics templates share one collection pass
         price_template = self.generate_price_analysis_article()
-        if 'error' not in price_template:
-            templates.append(price_template)
-        
         supplier_template = self.generate_supplier_guide_article()
-        if 'error' not in supplier_template:
-            templates.append(supplier_template)
-        
         moq_template = self.generate_moq_optimization_article()
-        if 'error' not in moq_template:
-            templates.append(moq_template)
         
-        return templates
-
+        return [
+            template for template in (price_template, supplier_template, moq_template)
+            if 'error' not in template
+        ]
 
 def generate_content_from_data():
     """Main function to generate all data-driven content templates."""
@@ -1,21 +1,179 @@
 # blog/features.py
+import base64
+import binascii
+import hashlib
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404
-from django.http import HttpResponse, JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.template.response import TemplateResponse
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import conditional_page, require_http_methods
 from django.views.decorators.cache import cache_page
 from django.core.cache import cache
-from django.db.models import Q, Count
+from django.db.models import Q, Count, Max
 from django.utils import timezone
 from django.contrib.syndication.views import Feed
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.functional import cached_property
+from django.utils.http import http_date, quote_etag
 from datetime import datetime, timedelta
 
-from blog.models import ArticlePage, Category
+from blog.models import ArticlePage, ArticlePageTag, Category
 from blog.analytics import analytics
 
+ARTICLE_COUNT_TIMEOUT = 120  # 2 minutes
+SITEMAP_CACHE_TIMEOUT = 3600  # 1 hour
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator that keeps its COUNT(*) in the cache under ``count_key``."""
+    
+    def __init__(self, object_list, per_page, count_key, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+    
+    @cached_property
+    def count(self):
+        count = cache.get(self.count_key)
+        if count is None:
+            count = super().count
+            cache.set(self.count_key, count, ARTICLE_COUNT_TIMEOUT)
+        return count
+
+
+class LazyPage(list):
+    """A page of results that knows whether another follows, but not the total."""
+    
+    def __init__(self, object_list, number, more):
+        super().__init__(object_list)
+        self.number = number
+        self.more = more
+    
+    def has_next(self):
+        return self.more
+    
+    def has_previous(self):
+        return self.number > 1
+
+
+class LazyPaginator:
+    """
+    Page-number pagination without COUNT(*).
+    
+    Each page fetches one extra row to tell whether a next page exists, so
+    callers get has_next/has_previous but no num_pages or count.
+    """
+    
+    def __init__(self, object_list, per_page):
+        self.object_list = object_list
+        self.per_page = per_page
+    
+    def get_page(self, number):
+        try:
+            number = max(int(number), 1)
+        except (TypeError, ValueError):
+            number = 1
+        offset = (number - 1) * self.per_page
+        rows = list(self.object_list[offset:offset + self.per_page + 1])
+        return LazyPage(rows[:self.per_page], number, len(rows) > self.per_page)
+
+
+def _encode_cursor(article):
+    """Opaque keyset cursor pointing just past ``article``."""
+    raw = f"{article.first_published_at.isoformat()}|{article.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor):
+    """Return ``(first_published_at, pk)`` for a cursor, or None if it is malformed."""
+    try:
+        published, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(published), int(pk)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+
 
-class BlogFeed(Feed):
+def keyset_page(articles, cursor, per_page, descending=True):
+    """
+    Return ``(page, next_cursor)`` for the articles after ``cursor``.
+    
+    Seeks on ``(first_published_at, id)`` instead of using OFFSET, so deep
+    pages cost the same as the first one. Only valid for date orderings.
+    """
+    if descending:
+        articles = articles.order_by('-first_published_at', '-id')
+    else:
+        articles = articles.order_by('first_published_at', 'id')
+    
+    position = _decode_cursor(cursor) if cursor else None
+    if position:
+        published, pk = position
+        if descending:
+            articles = articles.filter(
+                Q(first_published_at__lt=published) | Q(first_published_at=published, id__lt=pk)
+            )
+        else:
+            articles = articles.filter(
+                Q(first_published_at__gt=published) | Q(first_published_at=published, id__gt=pk)
+            )
+    
+    page = list(articles[:per_page + 1])
+    next_cursor = _encode_cursor(page[per_page - 1]) if len(page) > per_page else None
+    return page[:per_page], next_cursor
+
+
+# Columns a feed item reads; get_url() only needs url_path (and locale)
+FEED_ITEM_FIELDS = (
+    'title', 'intro', 'first_published_at', 'url_path', 'locale', 'category', 'content_type'
+)
+
+
+def feed_articles(articles):
+    """Latest 20 articles for a feed, without the streamfield body."""
+    return articles.only(*FEED_ITEM_FIELDS).select_related(
+        'category'
+    ).prefetch_related('tags').order_by('-first_published_at')[:20]
+
+
+class ConditionalFeedMixin:
+    """
+    Answer conditional GETs with a 304 before the feed is rendered.
+    
+    Validators come from the (pk, last_published_at) pairs of the listed
+    items, so publishing or editing any of them yields a new ETag.
+    """
+    
+    def __call__(self, request, *args, **kwargs):
+        try:
+            obj = self.get_object(request, *args, **kwargs)
+        except ObjectDoesNotExist:
+            raise Http404("Feed object does not exist.")
+        
+        versions = list(
+            self._get_dynamic_attr('items', obj)
+            .prefetch_related(None)
+            .values_list('pk', 'last_published_at')
+        )
+        etag = quote_etag(hashlib.md5(repr(versions).encode(), usedforsecurity=False).hexdigest())
+        published = [ts for _, ts in versions if ts]
+        last_modified = int(max(published).timestamp()) if published else None
+        
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            return response
+        
+        feedgen = self.get_feed(obj, request)
+        response = HttpResponse(content_type=feedgen.content_type)
+        feedgen.write(response, 'utf-8')
+        response.headers['ETag'] = etag
+        if last_modified is not None:
+            response.headers['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class BlogFeed(ConditionalFeedMixin, Feed):
     """RSS feed for blog articles."""
     
     title = "Ubongo IQ Blog"
@@ -24,7 +182,7 @@ class BlogFeed(Feed):
     feed_type = "application/rss+xml"
     
     def items(self):
-        return ArticlePage.objects.live().public().order_by('-first_published_at')[:20]
+        return feed_articles(ArticlePage.objects.live().public())
     
     def item_title(self, item):
         return item.title
@@ -49,7 +207,7 @@ class BlogFeed(Feed):
         return categories
 
 
-class CategoryFeed(Feed):
+class CategoryFeed(ConditionalFeedMixin, Feed):
     """RSS feed for specific category."""
     
     def get_object(self, request, category_slug):
@@ -65,9 +223,7 @@ class CategoryFeed(Feed):
         return obj.description or f"Latest {obj.name} articles from Ubongo IQ"
     
     def items(self, obj):
-        return ArticlePage.objects.live().public().filter(
-            category=obj
-        ).order_by('-first_published_at')[:20]
+        return feed_articles(ArticlePage.objects.live().public().filter(category=obj))
     
     def item_title(self, item):
         return item.title
@@ -96,16 +252,6 @@ def category_page(request, category_slug):
         category=category
     ).select_related('category').prefetch_related('tags')
     
-    # Apply additional filters if any
-    search = request.GET.get('search', '').strip()
-    if search:
-        articles = articles.filter(
-            Q(title__icontains=search) |
-            Q(intro__icontains=search) |
-            Q(body__icontains=search)
-        )
-        analytics.track_search(request, search, articles.count())
-    
     # Sorting
     sort = request.GET.get('sort', 'latest')
     if sort == 'popular':
@@ -115,16 +261,40 @@ def category_page(request, category_slug):
     else:
         articles = articles.order_by('-first_published_at')
     
-    # Pagination
-    from django.core.paginator import Paginator
-    paginator = Paginator(articles, 12)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Search the Wagtail index (full-text, GIN-backed on PostgreSQL) rather
+    # than ILIKE scans over title/intro/body; keeps the ordering above
+    search = request.GET.get('search', '').strip()
+    if search:
+        articles = articles.search(search, operator='and', order_by_relevance=False)
+    
+    # Keyset cursors need a date ordering on a plain queryset
+    seekable = sort != 'popular' and not search
+    
+    # Pagination; the total doesn't depend on sort order
+    search_hash = hashlib.md5(search.encode(), usedforsecurity=False).hexdigest()
+    paginator = CachedCountPaginator(
+        articles, 12, count_key=f"article_count:category:{category.id}:{search_hash}"
+    )
+    cursor = request.GET.get('cursor')
+    if cursor and seekable:
+        page_obj, next_cursor = keyset_page(articles, cursor, 12, descending=sort != 'oldest')
+    else:
+        page_number = request.GET.get('page')
+        page_obj = paginator.get_page(page_number)
+        next_cursor = (
+            _encode_cursor(page_obj[-1])
+            if seekable and page_obj.has_next() else None
+        )
+    
+    if search:
+        analytics.track_search(request, search, paginator.count)
     
-    # Get related categories
-    related_categories = Category.objects.exclude(id=category.id).annotate(
-        article_count=Count('articles', filter=Q(articles__live=True))
-    ).filter(article_count__gt=0)[:5]
+    # Get related categories from the shared cached counts (invalidated by
+    # blog.signals on article/category changes)
+    related_categories = [
+        other for other in Category.objects.with_article_counts()
+        if other.id != category.id
+    ][:5]
     
     context = {
         'category': category,
@@ -134,39 +304,47 @@ def category_page(request, category_slug):
         'search_query': search,
         'current_sort': sort,
         'total_articles': paginator.count,
+        'next_cursor': next_cursor,
     }
     
     return TemplateResponse(request, 'blog/category_detail.html', context)
 
 
 @require_http_methods(["GET"])
+@conditional_page
 def get_related_articles(request, article_id):
     """Get related articles for the current article."""
-    try:
-        article = ArticlePage.objects.get(id=article_id)
-    except ArticlePage.DoesNotExist:
-        return JsonResponse({'error': 'Article not found'}, status=404)
-    
     # Cache key for related articles
     cache_key = f"related_articles_{article_id}"
     related_articles = cache.get(cache_key)
     
     if related_articles is None:
+        category_ids = list(
+            ArticlePage.objects.filter(id=article_id).values_list('category_id', flat=True)
+        )
+        if not category_ids:
+            return JsonResponse({'error': 'Article not found'}, status=404)
+        category_id = category_ids[0]
+        
         # Find related articles based on category and tags
-        related = ArticlePage.objects.live().public().exclude(id=article_id)
+        related = ArticlePage.objects.live().public().exclude(id=article_id).select_related(
+            'category', 'featured_image'
+        ).prefetch_related('featured_image__renditions')
         
         # Same category articles
-        if article.category:
-            related = related.filter(category=article.category)
+        if category_id:
+            related = related.filter(category_id=category_id)
         
-        # Articles with similar tags
-        if article.tags.exists():
-            tag_names = list(article.tags.values_list('name', flat=True))
-            related = related.filter(tags__name__in=tag_names).distinct()
+        # Articles with similar tags, read straight from the through table
+        tag_ids = list(
+            ArticlePageTag.objects.filter(content_object_id=article_id).values_list('tag_id', flat=True)
+        )
+        if tag_ids:
+            related = related.filter(tags__id__in=tag_ids).distinct()
             
             # Order by number of matching tags
             related = related.annotate(
-                tag_matches=Count('tags', filter=Q(tags__name__in=tag_names))
+                tag_matches=Count('tags', filter=Q(tags__id__in=tag_ids))
             ).order_by('-tag_matches', '-first_published_at')
         else:
             related = related.order_by('-first_published_at')
@@ -202,6 +380,7 @@ def get_related_articles(request, article_id):
 
 
 @require_http_methods(["GET"])
+@conditional_page  # outside cache_page so only full 200s are cached
 @cache_page(60 * 60)  # Cache for 1 hour
 def popular_articles(request):
     """Get popular articles for sidebar/widgets."""
@@ -245,6 +424,7 @@ def popular_articles(request):
 
 
 @require_http_methods(["GET"])
+@conditional_page
 def tag_articles(request, tag_slug):
     """Get articles by tag."""
     from taggit.models import Tag
@@ -261,11 +441,29 @@ def tag_articles(request, tag_slug):
         tags__slug=tag_slug
     ).distinct().order_by('-first_published_at')
     
-    # Pagination
-    from django.core.paginator import Paginator
-    paginator = Paginator(articles, 12)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Pagination; no COUNT(*) unless the client asks for totals
+    cursor = request.GET.get('cursor')
+    if cursor:
+        page_obj, next_cursor = keyset_page(articles, cursor, 12)
+        pagination = {
+            'current_page': None,
+            'has_next': next_cursor is not None,
+            'has_previous': True,
+            'next_cursor': next_cursor,
+        }
+    else:
+        page_obj = LazyPaginator(articles, 12).get_page(request.GET.get('page'))
+        pagination = {
+            'current_page': page_obj.number,
+            'has_next': page_obj.has_next(),
+            'has_previous': page_obj.has_previous(),
+            'next_cursor': _encode_cursor(page_obj[-1]) if page_obj.has_next() else None,
+        }
+    
+    if request.GET.get('count') == '1':
+        paginator = CachedCountPaginator(articles, 12, count_key=f"article_count:tag:{tag.id}")
+        pagination['total_pages'] = paginator.num_pages
+        pagination['total_count'] = paginator.count
     
     # Serialize articles
     articles_data = []
@@ -290,13 +488,7 @@ def tag_articles(request, tag_slug):
             'slug': tag.slug,
         },
         'articles': articles_data,
-        'pagination': {
-            'current_page': page_obj.number,
-            'total_pages': paginator.num_pages,
-            'has_next': page_obj.has_next(),
-            'has_previous': page_obj.has_previous(),
-            'total_count': paginator.count,
-        }
+        'pagination': pagination,
     })
 
 
@@ -321,10 +513,15 @@ def share_article(request):
             metadata={'platform': platform}
         )
         
-        # Increment share count in cache
+        # Increment share count in cache; add() only seeds a missing key and
+        # incr() is atomic, so concurrent shares are never lost
         share_key = f"article_shares_{article_id}_{platform}"
-        current_shares = cache.get(share_key, 0)
-        cache.set(share_key, current_shares + 1, 86400)  # 24 hours
+        cache.add(share_key, 0, 86400)  # 24 hours
+        try:
+            cache.incr(share_key)
+        except ValueError:
+            # Key expired (or the backend stores nothing) between add() and incr()
+            cache.set(share_key, 1, 86400)
         
         return JsonResponse({'success': True, 'message': 'Share tracked'})
         
@@ -338,20 +535,36 @@ def generate_sitemap_xml(request):
     """Generate sitemap.xml for SEO."""
     from django.template.loader import render_to_string
     
-    # Get all live pages
-    pages = ArticlePage.objects.live().public().order_by('-last_published_at')
-    categories = Category.objects.annotate(
-        article_count=Count('articles', filter=Q(articles__live=True))
-    ).filter(article_count__gt=0)
-    
-    context = {
-        'pages': pages,
-        'categories': categories,
-        'request': request,
-    }
-    
-    xml_content = render_to_string('blog/sitemap.xml', context)
-    return HttpResponse(xml_content, content_type='application/xml')
+    # Any publish, edit or unpublish moves the newest timestamp or the count
+    live_pages = ArticlePage.objects.live().public()
+    state = live_pages.aggregate(latest=Max('last_published_at'), total=Count('id'))
+    latest = state['latest'].timestamp() if state['latest'] else 0
+    cache_key = f"sitemap:xml:{request.get_host()}:{latest}:{state['total']}"
+    
+    cached = cache.get(cache_key)
+    if cached is None:
+        pages = live_pages.order_by('-last_published_at')
+        categories = Category.objects.annotate(
+            article_count=Count('articles', filter=Q(articles__live=True))
+        ).filter(article_count__gt=0)
+        
+        context = {
+            'pages': pages,
+            'categories': categories,
+            'request': request,
+        }
+        
+        xml_content = render_to_string('blog/sitemap.xml', context).encode()
+        etag = quote_etag(hashlib.md5(xml_content, usedforsecurity=False).hexdigest())
+        cached = (xml_content, etag)
+        cache.set(cache_key, cached, SITEMAP_CACHE_TIMEOUT)
+    
+    xml_content, etag = cached
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(xml_content, content_type='application/xml')
+        response.headers['ETag'] = etag
+    return response
 
 
 def robots_txt(request):
@@ -378,15 +591,18 @@ def archive_view(request):
     
     articles = articles.order_by('-first_published_at')
     
-    # Group articles by month for archive view
-    from itertools import groupby
+    # Group articles by month for archive view, in one pass over listing
+    # columns only (no streamfield body)
     from django.utils.dates import MONTHS
     
     grouped_articles = {}
-    for key, group in groupby(articles, key=lambda x: (x.first_published_at.year, x.first_published_at.month) if x.first_published_at else (None, None)):
-        if key[0] and key[1]:
-            month_name = MONTHS[key[1]]
-            grouped_articles[f"{month_name} {key[0]}"] = list(group)
+    listed = articles.filter(first_published_at__isnull=False).only(
+        'title', 'slug', 'intro', 'first_published_at', 'url_path', 'locale', 'content_type'
+    )
+    for article in listed:
+        published = article.first_published_at
+        label = f"{MONTHS[published.month]} {published.year}"
+        grouped_articles.setdefault(label, []).append(article)
     
     context = {
         'grouped_articles': grouped_articles,
@@ -1,6 +1,9 @@
 # blog/image_optimization.py
+from concurrent.futures import ThreadPoolExecutor
+
 from django.conf import settings
-from wagtail.images.models import AbstractImage, AbstractRendition
+from django.db import connection
+from wagtail.images.models import AbstractImage, AbstractRendition, Filter
 from wagtail.images.rect import Rect
 from PIL import Image, ImageOps
 import pillow_avif
@@ -9,6 +12,16 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+RENDITION_WORKERS = 4
+
+
+def _render_in_thread(get_rendition, filter_spec):
+    """Produce a rendition in a worker thread and close the DB connection it used."""
+    try:
+        return get_rendition(filter_spec)
+    finally:
+        connection.close()
+
 
 class OptimizedImageMixin:
     """Mixin for optimized image handling."""
@@ -39,14 +52,44 @@ class OptimizedImageMixin:
             'large': base_filter,
             'xlarge': base_filter.replace('800x600', '1200x900'),
         }
+        formats = {
+            'avif': ('|format-avif', self.get_avif_rendition),
+            'webp': ('|format-webp', self.get_webp_rendition),
+            'original': ('', self.get_rendition),
+        }
+        
+        # Renditions that already exist come back from a single query
+        specs = {
+            filter_spec + suffix
+            for filter_spec in sizes.values() for suffix, _ in formats.values()
+        }
+        existing = {
+            rendition_filter.spec: rendition
+            for rendition_filter, rendition
+            in self.find_existing_renditions(*(Filter(spec=spec) for spec in specs)).items()
+        }
         
         responsive_set = {}
+        missing = []
         for size_name, filter_spec in sizes.items():
-            responsive_set[size_name] = {
-                'avif': self.get_avif_rendition(filter_spec),
-                'webp': self.get_webp_rendition(filter_spec),
-                'original': self.get_rendition(filter_spec)
-            }
+            responsive_set[size_name] = {}
+            for format_name, (suffix, _) in formats.items():
+                responsive_set[size_name][format_name] = existing.get(filter_spec + suffix)
+                if responsive_set[size_name][format_name] is None:
+                    missing.append((size_name, format_name))
+        
+        # Encoding releases the GIL inside Pillow, so cold renditions are
+        # generated in parallel, each through its usual fallback chain
+        if missing:
+            with ThreadPoolExecutor(max_workers=RENDITION_WORKERS) as pool:
+                futures = {
+                    (size_name, format_name): pool.submit(
+                        _render_in_thread, formats[format_name][1], sizes[size_name]
+                    )
+                    for size_name, format_name in missing
+                }
+            for (size_name, format_name), future in futures.items():
+                responsive_set[size_name][format_name] = future.result()
             
         return responsive_set
     
@@ -64,24 +107,34 @@ def optimize_image_on_upload(image_file, quality=85):
     """Optimize image on upload."""
     try:
         with Image.open(image_file) as img:
+            # Tier on the stored size; draft() below may already shrink JPEGs
+            oversized = img.size[0] > 2000 or img.size[1] > 2000
+            large = img.size[0] > 1200 or img.size[1] > 1200
+            
+            # JPEGs we are about to downsize can be decoded at a reduced DCT
+            # scale by libjpeg; a no-op for other formats
+            if oversized:
+                img.draft('RGB', (2000, 2000))
+            
             # Auto-rotate based on EXIF data
             img = ImageOps.exif_transpose(img)
             
-            # Convert RGBA to RGB if necessary
+            # Palette/alpha images are resized as RGBA so LANCZOS applies
             if img.mode in ('RGBA', 'LA', 'P'):
-                background = Image.new('RGB', img.size, (255, 255, 255))
-                if img.mode == 'P':
-                    img = img.convert('RGBA')
-                background.paste(img, mask=img.split()[-1])
-                img = background
+                img = img.convert('RGBA')
             
             # Compress based on size
-            if img.size[0] > 2000 or img.size[1] > 2000:
+            if oversized:
                 img.thumbnail((2000, 2000), Image.Resampling.LANCZOS)
                 quality = 80
-            elif img.size[0] > 1200 or img.size[1] > 1200:
+            elif large:
                 quality = 85
             
+            # Flatten onto white after resizing, in C, on the smaller canvas
+            if img.mode == 'RGBA':
+                background = Image.new('RGBA', img.size, (255, 255, 255, 255))
+                img = Image.alpha_composite(background, img).convert('RGB')
+            
             # Save optimized version
             img.save(
                 image_file,
@@ -11,8 +11,14 @@ class Command(BaseCommand):
         total = Image.objects.count()
         self.stdout.write(f"Found {total} images to convert...")
 
-        for i, img in enumerate(Image.objects.all()):
-            convert_image_to_avif.delay(img.id)
-            self.stdout.write(f"Queued image {i + 1}/{total}: {img.title}")
+        # Stream primary keys only; the task loads each image itself
+        image_ids = Image.objects.order_by("pk").values_list("pk", flat=True).iterator(chunk_size=1000)
+        queued = 0
+        for queued, image_id in enumerate(image_ids, 1):
+            convert_image_to_avif.delay(image_id)
+            if queued % 100 == 0:
+                self.stdout.write(f"Queued {queued}/{total} images...")
+
+        self.stdout.write(f"Queued {queued}/{total} images.")
 
         self.stdout.write(self.style.SUCCESS("All tasks queued!"))
@@ -1,5 +1,7 @@
+import io
+
 from django.core.management.base import BaseCommand
-from django.db import IntegrityError
+from django.db import connection, transaction
 import yfinance as yf
 
 from blog.models import StockHistory  
@@ -28,24 +30,62 @@ class Command(BaseCommand):
             data.reset_index(inplace=True)
             data['Date'] = data['Date'].dt.date 
 
-            saved_count = 0
-            for index, row in data.iterrows():
-                try:
-                    StockHistory.objects.create(
-                        ticker=ticker_symbol.upper(),
-                        date=row['Date'],
-                        open_price=row['Open'],
-                        high_price=row['High'],
-                        low_price=row['Low'],
-                        close_price=row['Close'],
-                        volume=row['Volume']
-                    )
-                    saved_count += 1
-                except IntegrityError:
-                    pass
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(f"Error saving row: {e}"))
+            ticker_upper = ticker_symbol.upper()
+            if connection.vendor == 'postgresql':
+                saved_count = self.copy_rows(data, ticker_upper)
+            else:
+                saved_count = self.bulk_create_rows(data, ticker_upper)
 
             self.stdout.write(self.style.SUCCESS(f"Successfully saved {saved_count} records for {ticker_symbol}."))
         except Exception as e:
-            self.stdout.write(self.style.ERROR(f"Error fetching data: {e}"))
\ No newline at end of file
+            self.stdout.write(self.style.ERROR(f"Error fetching data: {e}"))
+
+    def copy_rows(self, data, ticker):
+        """
+        Stream the frame into a temp table with COPY, then insert new dates.
+
+        Skips per-row ORM objects entirely; dates already stored for the
+        ticker are dropped by ON CONFLICT and not counted.
+        """
+        buffer = io.StringIO()
+        data[['Date', 'Open', 'High', 'Low', 'Close', 'Volume']].to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE TEMP TABLE stock_import ("
+                "date date, open_price numeric, high_price numeric, "
+                "low_price numeric, close_price numeric, volume bigint"
+                ") ON COMMIT DROP"
+            )
+            cursor.copy_expert("COPY stock_import FROM STDIN WITH CSV", buffer)
+            cursor.execute(
+                f"INSERT INTO {StockHistory._meta.db_table} "
+                "(ticker, date, open_price, high_price, low_price, close_price, volume, created_at) "
+                "SELECT %s, date, open_price, high_price, low_price, close_price, volume, now() "
+                "FROM stock_import ON CONFLICT (ticker, date) DO NOTHING",
+                [ticker]
+            )
+            return cursor.rowcount
+
+    def bulk_create_rows(self, data, ticker):
+        """Portable fallback: one bulk INSERT per batch through the ORM."""
+        rows = [
+            StockHistory(
+                ticker=ticker,
+                date=row.Date,
+                open_price=row.Open,
+                high_price=row.High,
+                low_price=row.Low,
+                close_price=row.Close,
+                volume=row.Volume
+            )
+            for row in data.itertuples(index=False)
+        ]
+
+        # ignore_conflicts hides which rows landed, so count around it
+        stored = StockHistory.objects.filter(ticker=ticker)
+        with transaction.atomic():
+            before = stored.count()
+            StockHistory.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+            return stored.count() - before
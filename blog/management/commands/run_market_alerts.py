@@ -112,7 +112,7 @@ class Command(BaseCommand):
                 style = self.style.NOTICE if hasattr(self.style, 'NOTICE') else lambda x: x
                 icon = '💡'
             
-            self.stdout.write(style(f'{icon} ALERT #{i} - {alert.level.value.upper()}'))
+            self.stdout.write(style(f'{icon} ALERT #{i} - {alert.level.name}'))
             self.stdout.write(f'   Title: {alert.title}')
             self.stdout.write(f'   Message: {alert.message}')
             self.stdout.write(f'   Affected Products: {alert.affected_products}')
@@ -173,7 +173,7 @@ class Command(BaseCommand):
         self.stdout.write('=' * 50)
         
         for i, alert in enumerate(cached_alerts, 1):
-            self.stdout.write(f'{i}. {alert.title} ({alert.level.value})')
+            self.stdout.write(f'{i}. {alert.title} ({alert.level.label})')
             self.stdout.write(f'   {alert.message}')
             self.stdout.write('')
     
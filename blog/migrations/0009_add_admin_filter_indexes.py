@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-16 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_stockhistory'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='scrapeddata',
+            index=models.Index(fields=['-scraped_at', 'content_generated'], name='sd_scraped_gen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scrapinglog',
+            index=models.Index(fields=['-started_at', 'status'], name='scrapelog_started_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contentgenerationrequest',
+            index=models.Index(fields=['status', '-created_at'], name='cgr_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contentgenerationqueue',
+            index=models.Index(fields=['processed', 'scheduled_for'], name='cgq_processed_sched_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-16 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_add_admin_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='scrapeddata',
+            index=models.Index(fields=['source', '-scraped_at'], name='sd_source_scraped_idx'),
+        ),
+    ]
@@ -105,6 +105,7 @@ class ArticlePage(Page, ArticleSEOMixin):
         index.SearchField("intro"),
         index.SearchField("body"),
         index.FilterField("category"),
+        index.FilterField("view_count"),
     ]
 
     parent_page_types = ["blog.BlogIndexPage"]
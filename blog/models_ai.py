@@ -64,6 +64,9 @@ class ContentGenerationRequest(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-created_at'], name='cgr_status_created_idx'),
+        ]
         verbose_name = "Content Generation Request"
         verbose_name_plural = "Content Generation Requests"
 
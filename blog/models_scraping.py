@@ -195,6 +195,8 @@ class ScrapedData(models.Model):
             models.Index(fields=['source', 'content_generated']),
             models.Index(fields=['scraped_at']),
             models.Index(fields=['category']),
+            models.Index(fields=['-scraped_at', 'content_generated'], name='sd_scraped_gen_idx'),
+            models.Index(fields=['source', '-scraped_at'], name='sd_source_scraped_idx'),
         ]
 
     panels = [
@@ -470,6 +472,9 @@ class ScrapingLog(models.Model):
 
     class Meta:
         ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['-started_at', 'status'], name='scrapelog_started_status_idx'),
+        ]
 
     panels = [
         MultiFieldPanel([
@@ -541,6 +546,9 @@ class ContentGenerationQueue(models.Model):
     
     class Meta:
         ordering = ['-priority', 'scheduled_for']
+        indexes = [
+            models.Index(fields=['processed', 'scheduled_for'], name='cgq_processed_sched_idx'),
+        ]
     
     panels = [
         MultiFieldPanel([
@@ -1,9 +1,12 @@
+from django.contrib.auth.models import User
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from wagtail.images.models import Image
 from django.core.cache import cache
 
+from blog.analysis import bump_report_version
 from blog.models import ArticlePage, Category
+from blog.models_scraping import ScrapedData
 from blog.tasks import convert_image_to_avif
 
 
@@ -19,6 +22,7 @@ def invalidate_article_caches(sender, instance, **kwargs):
     cache_keys = [
         "featured_articles",
         "categories_with_counts",
+        "default_category_id",
     ]
     common_limits = [5, 10, 20]
     for limit in common_limits:
@@ -36,3 +40,19 @@ def invalidate_article_caches(sender, instance, **kwargs):
 
     for key in cache_keys:
         cache.delete(key)
+
+    # Paginator totals are keyed per category/tag/search; drop them all
+    if hasattr(cache, "delete_pattern"):
+        cache.delete_pattern("article_count:*")
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_alert_recipients(sender, instance, **kwargs):
+    cache.delete("alert_recipients_v1")
+
+
+@receiver([post_save, post_delete], sender=ScrapedData)
+def invalidate_market_report(sender, instance, **kwargs):
+    # Every save bumps the version, so a report built mid-scrape is never
+    # served once the last row of the burst has landed
+    bump_report_version()
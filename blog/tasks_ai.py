@@ -0,0 +1,31 @@
+"""
+Celery tasks for AI content generation requests.
+"""
+import logging
+from typing import List
+
+from celery import shared_task
+from django.utils import timezone
+
+from blog.models_ai import ContentGenerationRequest
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def regenerate_content_requests(request_ids: List[int]):
+    """Reset failed or rejected content requests so they are generated again."""
+    count = ContentGenerationRequest.objects.filter(
+        id__in=request_ids,
+        status__in=['failed', 'rejected']
+    ).update(
+        status='pending',
+        generated_content='',
+        generated_outline='',
+        generated_title='',
+        review_notes='',
+        updated_at=timezone.now()
+    )
+    
+    logger.info(f"Marked {count} content requests for regeneration")
+    return count
@@ -1,13 +1,12 @@
 import logging
 from datetime import timedelta
-from typing import List
+from typing import List, Optional
 
 from celery import shared_task
 from django.utils import timezone
 from django.core.cache import cache
-from django.contrib.auth.models import User
 
-from blog.alerts import MarketAlertSystem, MarketAlert, AlertLevel
+from blog.alerts import MarketAlertSystem, MarketAlert, AlertLevel, alert_to_dict, get_alert_recipients
 from blog.models_scraping import ScrapingLog
 
 logger = logging.getLogger(__name__)
@@ -28,7 +27,7 @@ def monitor_market_changes():
             ]
             
             if critical_high_alerts:
-                send_alert_notifications.delay([a.__dict__ for a in critical_high_alerts])
+                send_alert_notifications.delay([alert_to_dict(a) for a in critical_high_alerts])
             
             logger.info(f"Market monitoring completed: {len(alerts)} alerts generated")
             return {
@@ -47,24 +46,23 @@ def monitor_market_changes():
 
 
 @shared_task
-def send_alert_notifications(alert_dicts: List[dict]):
+def send_alert_notifications(alert_dicts: List[dict], recipients: Optional[List[str]] = None):
     try:
         alerts = []
         for alert_dict in alert_dicts:
             class SimpleAlert:
                 def __init__(self, data):
-                    self.level = data.get('level')
+                    self.level = AlertLevel[data.get('level', 'medium').upper()]
                     self.title = data.get('title')
                     self.message = data.get('message')
                     self.action_required = data.get('action_required')
                     self.affected_products = data.get('affected_products')
+                    self.urgency_score = data.get('urgency_score', 0)
             
             alerts.append(SimpleAlert(alert_dict))
         
-        recipients = list(User.objects.filter(
-            is_superuser=True,
-            email__isnull=False
-        ).exclude(email='').values_list('email', flat=True))
+        if not recipients:
+            recipients = get_alert_recipients()
         
         if not recipients:
             logger.warning("No email recipients found for alert notifications")
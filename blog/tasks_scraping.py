@@ -2,7 +2,9 @@
 Celery tasks for web scraping and data-driven content generation.
 """
 import logging
+from collections import Counter, defaultdict
 from datetime import timedelta
+from itertools import islice
 from typing import List, Dict, Any
 
 from celery import shared_task
@@ -21,6 +23,9 @@ from utils.ai_client import ai_client
 
 logger = logging.getLogger(__name__)
 
+# Admin selections larger than this are handed off to Celery instead of run inline
+ASYNC_ACTION_THRESHOLD = 200
+
 
 @shared_task(bind=True, max_retries=3)
 def scrape_website(self, source_id: int):
@@ -237,45 +242,33 @@ def analyze_trends(source_id: int):
     )
     
     # Group by category and analyze trends
-    category_trends = {}
+    category_trends = defaultdict(lambda: {
+        'frequency': 0,
+        'total_views': 0,
+        'items': [],
+        'keywords': Counter()
+    })
     
     for item in recent_items:
-        category = item.category or 'uncategorized'
-        
-        if category not in category_trends:
-            category_trends[category] = {
-                'frequency': 0,
-                'total_views': 0,
-                'items': [],
-                'keywords': {}
-            }
+        trend = category_trends[item.category or 'uncategorized']
         
-        category_trends[category]['frequency'] += 1
-        category_trends[category]['total_views'] += item.views or 0
-        category_trends[category]['items'].append({
+        trend['frequency'] += 1
+        trend['total_views'] += item.views or 0
+        trend['items'].append({
             'id': item.id,
             'title': item.title,
             'url': item.url,
-            'price': item.price
+            'price': float(item.current_price) if item.current_price is not None else None
         })
         
         # Extract keywords from title and tags
-        keywords = extract_keywords(item.title + ' ' + item.tags)
-        for keyword in keywords:
-            if keyword in category_trends[category]['keywords']:
-                category_trends[category]['keywords'][keyword] += 1
-            else:
-                category_trends[category]['keywords'][keyword] = 1
+        trend['keywords'].update(extract_keywords(item.title + ' ' + item.tags))
     
     # Create or update TrendingTopic records
     for category, trend_data in category_trends.items():
         if trend_data['frequency'] >= 3:  # Minimum threshold
             # Find most popular keywords for this category
-            top_keywords = sorted(
-                trend_data['keywords'].items(), 
-                key=lambda x: x[1], 
-                reverse=True
-            )[:5]
+            top_keywords = trend_data['keywords'].most_common(5)
             
             for keyword, frequency in top_keywords:
                 trending_topic, created = TrendingTopic.objects.get_or_create(
@@ -370,6 +363,69 @@ def queue_trending_content(source_id: int):
     process_content_queue.delay()
 
 
+QUEUE_BATCH_SIZE = 500
+
+
+def queue_scraped_items(items, category_id):
+    """Queue review content for a batch of scraped items; returns the batch size."""
+    titles = [f"Review: {item.title}" for item in items]
+
+    # One SELECT for queue rows that already exist, one INSERT for the rest
+    queue_ids = dict(
+        ContentGenerationQueue.objects.filter(
+            title__in=titles
+        ).values_list('title', 'id')
+    )
+    new_rows = {}
+    for item, title in zip(items, titles):
+        if title in queue_ids or title in new_rows:
+            continue
+        new_rows[title] = ContentGenerationQueue(
+            target_category_id=category_id,
+            content_type='product_review',
+            title=title,
+            priority='normal',
+            context_data={
+                'scraped_item_id': item.id,
+                'source': item.source.name,
+                'price': (
+                    float(item.current_price)
+                    if item.current_price is not None else None
+                ),
+                'category': item.category
+            }
+        )
+    for queue_item in ContentGenerationQueue.objects.bulk_create(new_rows.values()):
+        queue_ids[queue_item.title] = queue_item.id
+
+    # Attach the scraped items through the M2M table in a single INSERT
+    Through = ContentGenerationQueue.scraped_items.through
+    Through.objects.bulk_create(
+        [
+            Through(contentgenerationqueue_id=queue_ids[title], scrapeddata_id=item.id)
+            for item, title in zip(items, titles)
+        ],
+        ignore_conflicts=True
+    )
+    return len(items)
+
+
+@shared_task
+def queue_scraped_items_for_content(scraped_item_ids: List[int], category_id: int):
+    """Queue review content for scraped items selected in the admin."""
+    items = (
+        ScrapedData.objects.filter(id__in=scraped_item_ids, content_generated=False)
+        .select_related('source')
+        .iterator(chunk_size=QUEUE_BATCH_SIZE)
+    )
+    count = 0
+    while batch := list(islice(items, QUEUE_BATCH_SIZE)):
+        count += queue_scraped_items(batch, category_id)
+    
+    logger.info(f"Queued {count} scraped items for content generation")
+    return count
+
+
 @shared_task
 def process_content_queue():
     """Process queued content generation requests."""
@@ -14,7 +14,7 @@ from django.db.models import Count, Avg, Sum, Q
 from blog.models_scraping import ScrapedData, ScrapingSource, ScrapingLog, TrendingTopic
 from blog.analysis import MarketIntelligenceAnalyzer
 from blog.content_templates import ContentTemplateGenerator
-from blog.alerts import MarketAlertSystem
+from blog.alerts import AlertLevel, MarketAlertSystem
 
 
 @staff_member_required
@@ -244,10 +244,10 @@ def api_alerts_summary(request):
         
         alert_summary = {
             'total_alerts': len(alerts),
-            'critical': len([a for a in alerts if hasattr(a, 'level') and a.level.value == 'critical']),
-            'high': len([a for a in alerts if hasattr(a, 'level') and a.level.value == 'high']),
-            'medium': len([a for a in alerts if hasattr(a, 'level') and a.level.value == 'medium']),
-            'low': len([a for a in alerts if hasattr(a, 'level') and a.level.value == 'low'])
+            'critical': len([a for a in alerts if hasattr(a, 'level') and a.level == AlertLevel.CRITICAL]),
+            'high': len([a for a in alerts if hasattr(a, 'level') and a.level == AlertLevel.HIGH]),
+            'medium': len([a for a in alerts if hasattr(a, 'level') and a.level == AlertLevel.MEDIUM]),
+            'low': len([a for a in alerts if hasattr(a, 'level') and a.level == AlertLevel.LOW])
         }
         
         # Recent alerts data
@@ -257,7 +257,7 @@ def api_alerts_summary(request):
                 recent_alerts.append({
                     'title': alert.title,
                     'message': alert.message,
-                    'level': alert.level.value if hasattr(alert, 'level') else 'unknown',
+                    'level': alert.level.label if hasattr(alert, 'level') else 'unknown',
                     'affected_products': getattr(alert, 'affected_products', 0),
                     'created_at': alert.created_at.isoformat() if hasattr(alert, 'created_at') else None
                 })
@@ -1,6 +1,8 @@
 # tests/test_tasks.py
-from django.test import TestCase, TransactionTestCase
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.core.cache import cache
+import json
+from datetime import datetime
 from unittest.mock import patch, Mock
 from celery import states
 from celery.exceptions import Retry
@@ -199,6 +201,47 @@ class AnalyticsTaskTest(TestCase):
         cache.clear()
 
 
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+})
+class AnalyticsCollectorTest(TestCase):
+    def setUp(self):
+        from blog.analytics import AnalyticsCollector
+
+        cache.clear()
+        self.collector = AnalyticsCollector()
+
+    def test_writer_does_not_mutate_returned_event(self):
+        event = self.collector.track_event('signup', {'plan': 'pro'}, user_id=1)
+        snapshot = dict(event)
+
+        self.collector._shutdown()
+
+        self.assertEqual(event, snapshot)
+        cached = json.loads(cache.get(f"analytics_event:{cache.get('analytics_event_seq')}"))
+        self.assertEqual(cached['event_type'], 'signup')
+        self.assertIsNotNone(datetime.fromisoformat(cached['timestamp']).tzinfo)
+
+    def test_event_ids_not_reused_after_counter_eviction(self):
+        self.collector.track_event('signup', {'plan': 'pro'})
+        self.collector._shutdown()
+        first_id = cache.get('analytics_event_seq')
+
+        cache.delete('analytics_event_seq')
+        self.collector.track_event('signup', {'plan': 'free'})
+        self.collector._shutdown()
+        second_id = cache.get('analytics_event_seq')
+
+        self.assertGreater(second_id, first_id)
+        first = json.loads(cache.get(f"analytics_event:{first_id}"))
+        second = json.loads(cache.get(f"analytics_event:{second_id}"))
+        self.assertEqual(first['data'], {'plan': 'pro'})
+        self.assertEqual(second['data'], {'plan': 'free'})
+
+    def tearDown(self):
+        cache.clear()
+
+
 class ImageTaskTest(TestCase):
     @patch('blog.tasks.WagtailImage.objects.get')
     @patch('blog.tasks.default_storage')
@@ -275,3 +318,103 @@ class CeleryIntegrationTest(TransactionTestCase):
     
     def tearDown(self):
         cache.clear()
+
+
+class AIAdminTaskTest(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from blog.models_ai import ContentGenerationRequest
+
+        self.user = User.objects.create_user(username="editor", password="pass")
+        self.category = Category.objects.create(name="Tech")
+        self.failed = ContentGenerationRequest.objects.create(
+            topic="Failed topic",
+            category=self.category,
+            requested_by=self.user,
+            status="failed",
+            generated_content="Old content"
+        )
+        self.approved = ContentGenerationRequest.objects.create(
+            topic="Approved topic",
+            category=self.category,
+            requested_by=self.user,
+            status="approved"
+        )
+
+    def test_regenerate_content_requests_only_resets_failed_or_rejected(self):
+        from blog.tasks_ai import regenerate_content_requests
+
+        count = regenerate_content_requests([self.failed.id, self.approved.id])
+
+        self.assertEqual(count, 1)
+        self.failed.refresh_from_db()
+        self.approved.refresh_from_db()
+        self.assertEqual(self.failed.status, "pending")
+        self.assertEqual(self.failed.generated_content, "")
+        self.assertEqual(self.approved.status, "approved")
+
+
+class ScrapingAdminTaskTest(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name="Tech")
+
+    def test_queue_scraped_items_for_content_links_items(self):
+        from blog.models_scraping import (
+            ScrapingSource, ScrapedData, ContentGenerationQueue
+        )
+        from blog.tasks_scraping import queue_scraped_items_for_content
+
+        source = ScrapingSource.objects.create(
+            name="Etsy", website="etsy", base_url="https://www.etsy.com"
+        )
+        items = [
+            ScrapedData.objects.create(
+                source=source,
+                external_id=str(i),
+                url=f"https://www.etsy.com/listing/{i}",
+                title=f"Item {i}"
+            )
+            for i in range(3)
+        ]
+
+        count = queue_scraped_items_for_content(
+            [item.id for item in items], self.category.id
+        )
+
+        self.assertEqual(count, 3)
+        self.assertEqual(ContentGenerationQueue.objects.count(), 3)
+        queue_item = ContentGenerationQueue.objects.get(title="Review: Item 0")
+        self.assertEqual(list(queue_item.scraped_items.all()), [items[0]])
+
+
+class MarketReportTest(TestCase):
+    def setUp(self):
+        from blog.models_scraping import ScrapingSource, ScrapedData
+
+        source = ScrapingSource.objects.create(
+            name="Alibaba", website="alibaba", base_url="https://www.alibaba.com"
+        )
+        for i, price in enumerate([10, 20, 30, 40, 50]):
+            ScrapedData.objects.create(
+                source=source,
+                external_id=str(i),
+                url=f"https://www.alibaba.com/product/{i}",
+                title=f"Product {i}",
+                category="Textiles" if i % 2 else "Electronics",
+                current_price=price,
+                discount_percentage=10 if i < 2 else None,
+                supplier_country="China",
+            )
+
+    def test_pricing_analysis_over_scraped_rows(self):
+        from blog.analysis import MarketIntelligenceAnalyzer
+
+        report = MarketIntelligenceAnalyzer().generate_comprehensive_report(use_cache=False)
+        pricing = report['pricing_analysis']
+
+        self.assertEqual(report['total_products'], 5)
+        self.assertEqual(pricing['total_products_with_pricing'], 5)
+        self.assertEqual(pricing['median_price'], 30)
+        self.assertEqual(pricing['average_price'], 30)
+        self.assertEqual(pricing['price_range'], {'min': 10, 'max': 50})
+        self.assertEqual(pricing['discount_analysis']['products_with_discounts'], 2)
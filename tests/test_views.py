@@ -239,6 +239,15 @@ class BlogViewsTest(TestCase, WagtailTestUtils):
         elif 'has_more' in data:
             self.assertIn('has_more', data)
     
+    def test_blog_feed(self):
+        """Test the RSS feed lists the latest articles."""
+        response = self.client.get(reverse('blog:feed'))
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Django Best Practices")
+        self.assertContains(response, "Learn Django best practices")
+        self.assertIn('ETag', response)
+    
     @patch('blog.views.cache_page')
     def test_caching_is_applied(self, mock_cache_page):
         """Test that caching decorator is applied to views."""
@@ -21,8 +21,7 @@ LOGGING = {
             'datefmt': '%Y-%m-%d %H:%M:%S',
         },
         'json': {
-            '()': 'pythonjsonlogger.jsonlogger.JsonFormatter',
-            'format': '%(levelname)s %(asctime)s %(module)s %(process)d %(thread)d %(message)s',
+            '()': 'utils.log_formatters.JSONFormatter',
             'datefmt': '%Y-%m-%d %H:%M:%S',
         },
         'performance': {
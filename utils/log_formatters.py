@@ -0,0 +1,49 @@
+"""
+Logging formatters for structured (JSON) log files.
+"""
+import json
+import logging
+
+try:
+    import orjson
+except ImportError:  # declared dependency; the stdlib encoder is only a safety net
+    orjson = None
+
+# Attributes every LogRecord has; anything else on a record came from ``extra``
+RESERVED_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+
+def dumps(payload):
+    """Serialise ``payload`` to a JSON string with orjson."""
+    if orjson is not None:
+        return orjson.dumps(
+            payload, default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+    return json.dumps(payload, default=str)
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Render each record, including its ``extra`` fields, as one JSON object.
+
+    Emits the same base fields as the previous python-json-logger format:
+    level, time, module, process, thread and message.
+    """
+
+    def format(self, record):
+        payload = {
+            'levelname': record.levelname,
+            'asctime': self.formatTime(record, self.datefmt),
+            'module': record.module,
+            'process': record.process,
+            'thread': record.thread,
+            'message': record.getMessage(),
+        }
+        payload.update(
+            (key, value) for key, value in record.__dict__.items()
+            if key not in RESERVED_ATTRS
+        )
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return dumps(payload)
@@ -0,0 +1,66 @@
+"""
+Paginators for admin changelists over large, unbounded tables.
+"""
+import logging
+
+from django.core.paginator import Paginator
+from django.db import OperationalError, connections, transaction
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+
+class TimeoutEstimatedCountPaginator(Paginator):
+    """
+    Paginator that gives up on an exact COUNT(*) after a short statement timeout.
+
+    On PostgreSQL the count runs with a local ``statement_timeout``, restored
+    afterwards; if it is cancelled, the planner's row estimate from
+    ``pg_class.reltuples`` is used instead so the changelist still renders.
+    Other backends count normally.
+    """
+
+    timeout_ms = 200
+    fallback_count = 9999999999
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        using = getattr(queryset, 'db', 'default')
+        connection = connections[using]
+
+        if connection.vendor != 'postgresql':
+            return super().count
+
+        try:
+            with transaction.atomic(using=using), connection.cursor() as cursor:
+                cursor.execute('SHOW statement_timeout')
+                previous_timeout = cursor.fetchone()[0]
+                cursor.execute('SET LOCAL statement_timeout TO %s', [self.timeout_ms])
+                count = super().count
+                # Inside an outer transaction this block is only a savepoint,
+                # so SET LOCAL would otherwise cap every later query
+                cursor.execute('SET LOCAL statement_timeout TO %s', [previous_timeout])
+                return count
+        except OperationalError:
+            logger.info(
+                "Exact count timed out after %sms for %s, using estimate",
+                self.timeout_ms, queryset.model._meta.db_table
+            )
+            return self._estimated_count(connection, queryset.model._meta.db_table)
+
+    def _estimated_count(self, connection, table):
+        """Return the planner's row estimate for ``table``."""
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                    [table]
+                )
+                row = cursor.fetchone()
+        except OperationalError:
+            row = None
+
+        if row and row[0] and row[0] > 0:
+            return row[0]
+        return self.fallback_count